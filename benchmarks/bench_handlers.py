@@ -0,0 +1,279 @@
+"""
+Benchmark offline dos handlers do bot.
+
+Sobe o servidor local (`standin_server.py`) com as fixtures de `fixtures.py`
+(sintéticas, ou as páginas gravadas por `record_fixtures.py` quando existem),
+aponta os serviços para ele e dispara `button_handler`, `check_live` e
+`send_cheer_poll` com Updates sintéticos. Reporta p50/p95/p99, throughput,
+erros e chamadas upstream por callback_data.
+
+Com `--memory`, reporta também o pico de memória de cada cenário, medido
+pelo `tracemalloc` acima do que já estava alocado quando o cenário começou
+(heap do Python, não o RSS do processo). O rastreio deixa as alocações
+bem mais lentas, então as latências dessa rodada não servem de comparação.
+
+    python benchmarks/bench_handlers.py [--requests 200] [--concurrency 50] \\
+        [--cold] [--memory] [--json results.json]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from standin_server import start_server, upstream_hits
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+CALLBACKS = ["menu_main", "menu_stats", "last_result", "stats_top", "next_match", "cheer_poll"]
+
+
+# --- Fakes do Telegram: só o que os handlers usam ---
+class FakeBot:
+    """Bot que responde localmente, com latência opcional de API."""
+
+    def __init__(self, latency: float, limiter=None) -> None:
+        self.latency = latency
+        self.limiter = limiter
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    async def _call(self, chat_id=None, rate_limit_args=None) -> None:
+        async def request() -> bool:
+            self.calls += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return True
+
+        if self.limiter is None:
+            await request()
+        else:
+            # mesmo caminho do ExtBot com rate limiter configurado
+            await self.limiter.process_request(
+                request, (), {}, "fake", {"chat_id": chat_id}, rate_limit_args
+            )
+
+    def _message(self, chat_id: int) -> "FakeMessage":
+        return FakeMessage(self, chat_id, next(self._ids))
+
+    async def send_message(self, chat_id, text=None, rate_limit_args=None, **kwargs):
+        await self._call(chat_id, rate_limit_args)
+        return self._message(chat_id)
+
+    async def edit_message_text(self, text=None, chat_id=None, message_id=None, rate_limit_args=None, **kwargs):
+        await self._call(chat_id, rate_limit_args)
+        return True
+
+    async def send_chat_action(self, chat_id, action, **kwargs):
+        await self._call()
+        return True
+
+    async def send_poll(self, chat_id, question, options, **kwargs):
+        await self._call()
+        return self._message(chat_id)
+
+
+class FakeMessage:
+    def __init__(self, bot: FakeBot, chat_id: int, message_id: int) -> None:
+        self._bot = bot
+        self.chat_id = chat_id
+        self.chat = SimpleNamespace(id=chat_id)
+        self.message_id = message_id
+        self.reply_markup = None
+
+    async def reply_text(self, text, **kwargs):
+        return await self._bot.send_message(self.chat_id, text)
+
+
+class FakeQuery:
+    def __init__(self, bot: FakeBot, chat_id: int, data: str) -> None:
+        self._bot = bot
+        self.data = data
+        self.message = FakeMessage(bot, chat_id, 1)
+
+    async def answer(self, *args, **kwargs):
+        await self._bot._call()
+
+    async def edit_message_text(self, text=None, **kwargs):
+        await self._bot._call()
+
+
+class FakeJob:
+    def schedule_removal(self) -> None:
+        pass
+
+
+class FakeJobQueue:
+    """Descarta os agendamentos: cada tick do benchmark é disparado à mão."""
+
+    def run_once(self, callback, when, **kwargs) -> FakeJob:
+        return FakeJob()
+
+    def get_jobs_by_name(self, name: str) -> list:
+        return []
+
+
+def make_update(bot: FakeBot, chat_id: int, data: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        callback_query=FakeQuery(bot, chat_id, data),
+        effective_chat=SimpleNamespace(id=chat_id),
+        message=None,
+    )
+
+
+def make_context(bot: FakeBot, female: bool) -> SimpleNamespace:
+    return SimpleNamespace(bot=bot, user_data={"female": female}, job=FakeJob(), job_queue=FakeJobQueue())
+
+
+# --- Execução ---
+def percentile(samples: List[float], pct: int) -> float:
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method="inclusive")[pct - 1]
+
+
+def peak_alloc_kb(baseline: int) -> Optional[float]:
+    """Pico alocado acima de `baseline` desde o último `reset_peak()` (None sem tracemalloc)."""
+    if not tracemalloc.is_tracing():
+        return None
+    return (tracemalloc.get_traced_memory()[1] - baseline) / 1024
+
+
+async def run_scenario(name: str, make_call, total: int, concurrency: int, reset) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    hits_before = sum(upstream_hits().values())
+    baseline = 0
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            reset()
+            start = time.perf_counter()
+            try:
+                await make_call(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    wall = time.perf_counter() - wall
+
+    return {
+        "scenario": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "throughput_rps": total / wall if wall else 0.0,
+        "upstream_requests": sum(upstream_hits().values()) - hits_before,
+        "peak_alloc_kb": peak_alloc_kb(baseline),
+    }
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    server, base = start_server(delay_ms=args.upstream_delay_ms)
+    os.environ["UPSTREAM_BASE_URL"] = base
+    os.environ.setdefault("PANDASCORE_TOKEN", "bench")
+    os.environ.setdefault("LIVE_STORE", "memory")
+    os.environ.setdefault("MATCH_HISTORY_PATH", ":memory:")
+    os.environ.setdefault("HTTP_CACHE_PATH", ":memory:")
+    os.environ.setdefault("CHEER_POLLS_PATH", ":memory:")
+    sys.path.insert(0, str(SRC))
+
+    import handlers
+    import startup
+    from outbound import OutboundRateLimiter, outbox
+    from services.cache import cache
+    from services.http_client import close_clients
+
+    # o bot carrega os scrapers em background após o boot; aqui, antes de medir
+    startup.import_modules(handlers.HEAVY_MODULES)
+
+    def reset() -> None:
+        if args.cold:
+            cache._entries.clear()
+
+    if args.memory:
+        tracemalloc.start()
+    bot = FakeBot(args.telegram_latency_ms / 1000)
+    results = []
+    try:
+        for data in args.callbacks:
+            async def click(i: int, data: str = data) -> None:
+                chat_id = 10_000 + i
+                await handlers.button_handler(
+                    make_update(bot, chat_id, data), make_context(bot, args.female)
+                )
+            results.append(await run_scenario(data, click, args.requests, args.concurrency, reset))
+
+        async def poll(i: int) -> None:
+            await handlers.send_cheer_poll(chat_id=20_000 + i, bot=bot)
+        results.append(await run_scenario("send_cheer_poll", poll, args.requests, args.concurrency, reset))
+
+        # check_live: um tick com fan-out para `--live-chats` chats, até a
+        # última mensagem sair pelo rate limiter (limites reais do Telegram)
+        live_bot = FakeBot(args.telegram_latency_ms / 1000, limiter=OutboundRateLimiter())
+
+        async def tick(i: int) -> None:
+            handlers.live_states.clear()
+            for chat_id in range(30_000, 30_000 + args.live_chats):
+                line = "FURIA_Female" if chat_id % 2 else "FURIA"
+                handlers.live_states[chat_id] = {
+                    "status": "active", "line": line, "message_id": None, "hash": None, "round": None
+                }
+            await handlers.check_live(make_context(live_bot, False))
+            await outbox.drain()
+        results.append(await run_scenario("check_live", tick, args.live_ticks, 1, reset))
+        handlers.live_states.clear()
+    finally:
+        tracemalloc.stop()
+        await outbox.stop()
+        await close_clients()
+        server.shutdown()
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="cliques por callback_data")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--callbacks", nargs="+", default=CALLBACKS)
+    parser.add_argument("--female", action="store_true", help="usa a line feminina")
+    parser.add_argument("--cold", action="store_true", help="limpa o cache antes de cada requisição")
+    parser.add_argument("--upstream-delay-ms", type=float, default=0.0)
+    parser.add_argument("--telegram-latency-ms", type=float, default=0.0)
+    parser.add_argument("--live-chats", type=int, default=100)
+    parser.add_argument("--live-ticks", type=int, default=3)
+    parser.add_argument("--memory", action="store_true", help="mede o pico de memória (tracemalloc)")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(main(args))
+
+    print(f"{'scenario':<16} {'p50':>9} {'p95':>9} {'p99':>9} {'req/s':>9} {'err':>5} {'upstr':>6} {'mem MB':>7}")
+    for r in results:
+        mem = f"{r['peak_alloc_kb'] / 1024:>7.1f}" if r["peak_alloc_kb"] is not None else f"{'-':>7}"
+        print(
+            f"{r['scenario']:<16} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms "
+            f"{r['throughput_rps']:>9.1f} {r['errors']:>5} {r['upstream_requests']:>6} {mem}"
+        )
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
@@ -0,0 +1,93 @@
+"""
+Benchmark de alocação dos teclados inline.
+
+Compara, por update, montar o teclado na hora (como antes do registro de
+`markups.py`) com reaproveitar o teclado pronto, incluindo a serialização
+que o python-telegram-bot faz a cada requisição (`to_dict` + JSON).
+
+    python benchmarks/bench_markups.py [--iterations 20000] [--json out.json]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup  # noqa: E402
+
+import markups  # noqa: E402
+
+
+def rebuild(template):
+    """Teclado novo (botões inclusive) a cada update, como os builders faziam."""
+    rows = [[(b.text, b.callback_data, b.url) for b in row] for row in template.inline_keyboard]
+
+    def run():
+        markup = InlineKeyboardMarkup([
+            [InlineKeyboardButton(text, callback_data=data, url=url) for text, data, url in row]
+            for row in rows
+        ])
+        return json.dumps(markup.to_dict())
+    return run
+
+
+def prebuilt(getter, *args):
+    def run():
+        return json.dumps(getter(*args).to_dict())
+    return run
+
+
+CASES = {
+    "main_menu": (rebuild(markups.MAIN_MENU[True]), prebuilt(markups.main_menu_markup, True)),
+    "stats_menu": (rebuild(markups.STATS_MENU), prebuilt(markups.stats_menu_markup)),
+    "socials_menu": (rebuild(markups.SOCIALS_FEMALE_MENU), prebuilt(markups.socials_female_menu_markup)),
+    "live_round_nav": (rebuild(markups.LIVE_ROUND_NAV), prebuilt(markups.live_round_markup)),
+}
+
+
+def measure(func, iterations):
+    """(µs por update, pico de KiB alocados durante um update)."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+
+    peaks = []
+    tracemalloc.start()
+    for _ in range(min(200, iterations)):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return elapsed / iterations * 1e6, sorted(peaks)[len(peaks) // 2] / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    results = []
+    for name, (legacy, current) in CASES.items():
+        for variant, func in (("rebuild", legacy), ("prebuilt", current)):
+            us, kib = measure(func, args.iterations)
+            results.append({
+                "markup": name, "variant": variant, "us_per_update": us, "peak_kib_per_update": kib,
+            })
+
+    print(f"{'markup':<16} {'variante':<10} {'µs/update':>10} {'pico KiB/update':>16}")
+    for r in results:
+        print(f"{r['markup']:<16} {r['variant']:<10} {r['us_per_update']:>10.1f} "
+              f"{r['peak_kib_per_update']:>16.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark do envio em massa pelo rate limiter + dispatcher de broadcast.
+
+Simula o Telegram localmente (limite global e por chat, com `RetryAfter`
+quando estourados), dispara um placar ao vivo para `--chats` chats com
+`--updates` placares seguidos e, no meio, cliques interativos. Reporta a
+vazão sustentada, os RetryAfter, as edições coalescidas e a latência das
+respostas interativas durante o broadcast.
+
+    python benchmarks/bench_outbound.py [--chats 2000] [--updates 3] [--json out.json]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from telegram.error import RetryAfter  # noqa: E402
+
+from outbound import COALESCED, RETRY_AFTERS, BroadcastDispatcher, OutboundRateLimiter, Priority  # noqa: E402
+
+
+class FakeTelegram:
+    """Aceita até `rate` requests/s (janela deslizante de 1 s) e 1/s por chat."""
+
+    def __init__(self, rate: float, latency: float) -> None:
+        self.rate = rate
+        self.latency = latency
+        self.window = deque()
+        self.last_by_chat = {}
+        self.delivered = 0
+        self.rejected = 0
+
+    async def request(self, chat_id: int) -> bool:
+        now = time.monotonic()
+        while self.window and now - self.window[0] > 1.0:
+            self.window.popleft()
+        last = self.last_by_chat.get(chat_id)
+        # tolera rajadas curtas por chat, como o Telegram
+        if len(self.window) >= self.rate or (last is not None and now - last < 0.2):
+            self.rejected += 1
+            raise RetryAfter(1)
+        self.window.append(now)
+        self.last_by_chat[chat_id] = now
+        await asyncio.sleep(self.latency)
+        self.delivered += 1
+        return True
+
+
+async def run(args: argparse.Namespace) -> dict:
+    telegram = FakeTelegram(args.telegram_rate, args.latency_ms / 1000)
+    limiter = OutboundRateLimiter(global_rate=args.rate)
+    dispatcher = BroadcastDispatcher()
+
+    def send(chat_id: int, priority: Priority):
+        return limiter.process_request(
+            lambda: telegram.request(chat_id), (), {}, "editMessageText", {"chat_id": chat_id}, priority
+        )
+
+    interactive = []
+
+    async def click(chat_id: int) -> None:
+        start = time.perf_counter()
+        await send(chat_id, Priority.INTERACTIVE)
+        interactive.append(time.perf_counter() - start)
+
+    retry_before = RETRY_AFTERS.value()
+    coalesced_before = COALESCED.value()
+    start = time.perf_counter()
+    clicks = []
+    for update in range(args.updates):
+        for chat_id in range(1, args.chats + 1):
+            dispatcher.submit(("live", chat_id), lambda chat_id=chat_id: send(chat_id, Priority.BROADCAST))
+        # usuários clicando enquanto o broadcast está na fila
+        for i in range(args.clicks):
+            clicks.append(asyncio.ensure_future(click(1_000_000 + update * args.clicks + i)))
+        await asyncio.sleep(args.update_interval)
+    await dispatcher.drain()
+    await asyncio.gather(*clicks)
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+
+    latencies = sorted(interactive)
+    return {
+        "chats": args.chats,
+        "updates": args.updates,
+        "delivered": telegram.delivered,
+        "elapsed_s": elapsed,
+        "msgs_per_s": telegram.delivered / elapsed,
+        "retry_after": RETRY_AFTERS.value() - retry_before,
+        "coalesced": COALESCED.value() - coalesced_before,
+        "interactive_p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "interactive_p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=2000)
+    parser.add_argument("--updates", type=int, default=3, help="placares enviados em sequência")
+    parser.add_argument("--update-interval", type=float, default=5.0, help="segundos entre placares")
+    parser.add_argument("--clicks", type=int, default=20, help="cliques interativos por placar")
+    parser.add_argument("--rate", type=float, default=30.0, help="limite global do rate limiter")
+    parser.add_argument("--telegram-rate", type=float, default=30.0, help="limite global do Telegram simulado")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="latência simulada do Bot API")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    for key, value in result.items():
+        print(f"{key:<22} {value:>12.1f}" if isinstance(value, float) else f"{key:<22} {value:>12}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Benchmark dos parsers de HTML dos serviços.
+
+Compara o parse legado (árvore inteira com `html.parser`) com os parsers
+atuais em cada backend disponível, usando as fixtures de `fixtures.py`.
+Antes de medir, confere que cada parser atual devolve exatamente o mesmo
+resultado que o legado na fixture (senão o speedup não quer dizer nada).
+
+    python benchmarks/bench_parsers.py [--repeat 20] [--json out.json]
+"""
+import argparse
+import functools
+import importlib.util
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fixtures import load_fixture  # noqa: E402
+from services import html_parser  # noqa: E402
+from services.last_scoreboard import parse_furia_scoreboard  # noqa: E402
+from services.next_match import extract_upcoming, parse_upcoming_matches  # noqa: E402
+from services.match_history import BACKFILL_LIMIT  # noqa: E402
+from services.result_matcher import parse_matches  # noqa: E402
+from services.roster_service import parse_roster  # noqa: E402
+
+
+# --- parse legado: árvore inteira + busca, como antes do html_parser ---
+# Cada um faz o mesmo trabalho (e devolve o mesmo resultado) que o parser atual.
+def legacy_matches(html, limit=BACKFILL_LIMIT):
+    table = BeautifulSoup(html, "html.parser").find("table", class_="wikitable")
+    if not table:
+        return []
+    matches = []
+    for row in table.find_all("tr")[1:]:
+        cols = row.find_all("td")
+        if len(cols) >= 9:
+            score = cols[7].text.strip()
+            opp_a = cols[8].find("a", title=True)
+            m = re.findall(r"\d+", score)
+            if len(m) >= 2:
+                left, right = map(int, m[:2])
+                result = "Vitória!🎉" if left > right else "Derrota...😿"
+            else:
+                result = "Vitória!🎉" if "win" in score.lower() else "Derrota...😿"
+            matches.append({
+                "Date": cols[0].text.strip(),
+                "Event": cols[5].text.strip(),
+                "Opponent": opp_a["title"].strip() if opp_a else cols[8].text.strip(),
+                "Score": score,
+                "Result": result,
+            })
+            if len(matches) >= limit:
+                break
+    return matches
+
+
+def legacy_roster(html):
+    table = BeautifulSoup(html, "html.parser").find("table", class_="wikitable wikitable-striped roster-card")
+    if not table:
+        return []
+    players = []
+    for row in table.find_all("tr", class_="Player"):
+        if "roster-coach" in row.get("class", []):
+            continue
+        id_cell = row.find("td", class_="ID")
+        link = id_cell.find("a") if id_cell else None
+        if link and link.text.strip():
+            players.append(link.text.strip())
+    return players
+
+
+def legacy_scoreboard(html, max_players=5):
+    scoreboard = {}
+    for row in BeautifulSoup(html, "html.parser").find_all("div", class_="table-row"):
+        if "total" in row.get("class", []):
+            continue
+        nick_tag = row.find("span", class_="nickname")
+        if not nick_tag:
+            continue
+        cells = {
+            "Kills": row.select_one("div.table-cell.kills p.value"),
+            "Deaths": row.select_one("div.table-cell.deaths p.value"),
+            "Assists": row.select_one("div.table-cell.assists p.value"),
+            "ADR": row.select_one("div.table-cell.adr p.value"),
+            "Score": row.select_one("span.c-table-cell-score__value"),
+        }
+        scoreboard[nick_tag.text.strip()] = {k: v.text.strip() if v else "-" for k, v in cells.items()}
+        if len(scoreboard) >= max_players:
+            break
+    return scoreboard
+
+
+def legacy_upcoming(html):
+    soup = BeautifulSoup(html, "html.parser")
+    results = []
+    for date_tag in soup.select("p.MatchList__MatchListDate-sc-1pio0qc-0"):
+        date_text = date_tag.get_text(strip=True).replace("📅 ", "")
+        for card in date_tag.find_next_siblings():
+            if card.name == "p" and "MatchList__MatchListDate-sc-1pio0qc-0" in card.get("class", []):
+                break
+            if card.name == "a" and "MatchCardSimple__MatchContainer-sc-wcmxha-0" in card.get("class", []):
+                (team1, score1), (team2, score2) = [
+                    (
+                        div.select_one("span").get_text(strip=True),
+                        div.select_one("div.MatchCardSimple__Score-sc-wcmxha-15").get_text(strip=True)
+                    )
+                    for div in card.select("div.MatchCardSimple__MatchTeam-sc-wcmxha-11")
+                ]
+                results.append({
+                    "date": date_text,
+                    "time": card.select_one("small.MatchCardSimple__MatchTime-sc-wcmxha-3").get_text(strip=True),
+                    "team1": team1, "score1": score1,
+                    "team2": team2, "score2": score2,
+                    "best_of": card.select_one("div.MatchCardSimple__Badge-sc-wcmxha-18").get_text(strip=True),
+                    "tournament": card.select_one("div.MatchCardSimple__Tournament-sc-wcmxha-34").get_text(strip=True),
+                })
+    return results
+
+
+# fixture -> (parse legado, parser atual, fixture do parse legado)
+# O HTML cru do draft5 (agenda no __NEXT_DATA__) não tem o que o parse legado
+# ler: antes ele só existia depois de renderizar a página no Chromium, então o
+# legado roda sobre a página renderizada e precisa chegar na mesma agenda.
+CASES = {
+    # primeira sincronização do histórico: índice vazio, até BACKFILL_LIMIT partidas
+    "liquipedia_matches": (
+        legacy_matches, functools.partial(parse_matches, limit=BACKFILL_LIMIT), "liquipedia_matches"
+    ),
+    "liquipedia_roster": (legacy_roster, parse_roster, "liquipedia_roster"),
+    "bo3_scoreboard": (legacy_scoreboard, parse_furia_scoreboard, "bo3_scoreboard"),
+    "draft5_upcoming": (legacy_upcoming, parse_upcoming_matches, "draft5_upcoming"),
+    "draft5_upcoming_raw": (legacy_upcoming, extract_upcoming, "draft5_upcoming"),
+}
+
+
+def check_same_output(name, legacy, current, legacy_html, html, backends):
+    """Falha se o parser atual diverge do legado: só então o speedup compara a mesma coisa."""
+    expected = legacy(legacy_html)
+    assert expected, f"{name}: o parse legado não achou nada na fixture"
+    for backend in backends:
+        html_parser.PARSER_BACKEND = backend
+        got = current(html)
+        assert got == expected, f"{name} ({backend}) diverge do parse legado:\n{got!r}\n!=\n{expected!r}"
+
+
+def timeit(func, html, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    backends = ["html.parser"]
+    if importlib.util.find_spec("lxml") is not None:
+        backends.append("lxml")
+
+    results = []
+    for name, (legacy, current, legacy_fixture) in CASES.items():
+        html = load_fixture(name)
+        legacy_html = load_fixture(legacy_fixture)
+        check_same_output(name, legacy, current, legacy_html, html, backends)
+        baseline = timeit(legacy, legacy_html, args.repeat)
+        results.append({"fixture": name, "parser": "legacy", "median_ms": baseline * 1000, "speedup": 1.0})
+        for backend in backends:
+            html_parser.PARSER_BACKEND = backend
+            elapsed = timeit(current, html, args.repeat)
+            results.append({
+                "fixture": name,
+                "parser": backend,
+                "median_ms": elapsed * 1000,
+                "speedup": baseline / elapsed if elapsed else float("inf"),
+            })
+
+    print(f"{'fixture':<20} {'parser':<12} {'mediana (ms)':>12} {'speedup':>8}")
+    for r in results:
+        print(f"{r['fixture']:<20} {r['parser']:<12} {r['median_ms']:>12.2f} {r['speedup']:>7.1f}x")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
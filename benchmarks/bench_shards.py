@@ -0,0 +1,106 @@
+"""
+Benchmark do modo multi-processo (router + workers por shard de chat).
+
+Gera updates cruas (JSON do Bot API) de `--chats` chats, roteia cada uma
+com `chat_id_of`/`shard_of` para a fila do worker dono, como o router.py,
+e cada worker faz o trabalho de CPU de um clique (parse de uma fixture).
+Reporta updates/s para cada número de shards e confere que a ordem por
+chat foi mantida.
+
+    python benchmarks/bench_shards.py [--shards 1 2 4] [--updates 400] [--json out.json]
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fixtures import load_fixture  # noqa: E402
+from services.sharding import chat_id_of, shard_of  # noqa: E402
+
+
+def worker(updates, results, fixture: str) -> None:
+    from services.roster_service import parse_roster
+
+    html = load_fixture(fixture)
+    last_seq = {}
+    handled = out_of_order = 0
+    while (update := updates.get()) is not None:
+        chat_id = chat_id_of(update)
+        seq = update["update_id"]
+        if last_seq.get(chat_id, -1) > seq:
+            out_of_order += 1
+        last_seq[chat_id] = seq
+        parse_roster(html)
+        handled += 1
+    results.put((handled, out_of_order))
+
+
+def make_update(update_id: int, chat_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": {"id": chat_id, "is_bot": False, "first_name": "fã"},
+            "chat_instance": str(chat_id),
+            "data": "stats_top",
+            "message": {"message_id": 1, "date": 0, "chat": {"id": chat_id, "type": "private"}},
+        },
+    }
+
+
+def run(shards: int, args: argparse.Namespace) -> dict:
+    mp = multiprocessing.get_context("spawn")
+    queues = [mp.Queue(maxsize=1000) for _ in range(shards)]
+    results = mp.Queue()
+    workers = [mp.Process(target=worker, args=(q, results, args.fixture)) for q in queues]
+    for process in workers:
+        process.start()
+    # aquece: espera os workers importarem e carregarem a fixture
+    for q in queues:
+        q.put(make_update(-1, 0))
+
+    start = time.perf_counter()
+    for update_id in range(args.updates):
+        update = make_update(update_id, 1 + update_id % args.chats)
+        queues[shard_of(chat_id_of(update), shards)].put(update)
+    for q in queues:
+        q.put(None)
+    totals = [results.get() for _ in workers]
+    elapsed = time.perf_counter() - start
+    for process in workers:
+        process.join()
+
+    return {
+        "shards": shards,
+        "updates": sum(t[0] for t in totals) - shards,
+        "elapsed_s": elapsed,
+        "updates_per_s": args.updates / elapsed,
+        "out_of_order": sum(t[1] for t in totals),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--updates", type=int, default=400)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--fixture", default="liquipedia_roster")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    results = [run(shards, args) for shards in args.shards]
+    base = results[0]["updates_per_s"]
+    print(f"{'shards':>6} {'updates/s':>10} {'speedup':>8} {'fora de ordem':>14}")
+    for r in results:
+        print(f"{r['shards']:>6} {r['updates_per_s']:>10.1f} {r['updates_per_s'] / base:>7.2f}x "
+              f"{r['out_of_order']:>14}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Fixtures de HTML para os benchmarks.
+
+Se existir `benchmarks/fixtures/<nome>.html` (página gravada), ela é usada.
+Senão, gera uma página sintética determinística com a mesma estrutura que
+os scrapers esperam e tamanho parecido com a página real.
+"""
+import json
+import random
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+_FILLER = (
+    '<div class="navbox"><table class="nowraplinks"><tr><th>{i}</th>'
+    '<td><a href="/counterstrike/Team_{i}" title="Team {i}">Team {i}</a> · '
+    '<span class="flag"><img src="/commons/images/{i}.png" alt=""></span></td></tr></table></div>\n'
+)
+
+
+def _page(body: str, filler_blocks: int) -> str:
+    rng = random.Random(filler_blocks)
+    head = "".join(_FILLER.format(i=rng.randint(0, 10_000)) for _ in range(filler_blocks // 4))
+    tail = "".join(_FILLER.format(i=rng.randint(0, 10_000)) for _ in range(filler_blocks))
+    return f"<html><head><title>fixture</title></head><body>{head}{body}{tail}</body></html>"
+
+
+def liquipedia_matches(rows: int = 800) -> str:
+    header = "<tr>" + "".join(f"<th>Col{i}</th>" for i in range(10)) + "</tr>"
+    body = []
+    for i in range(rows):
+        day = 28 - i % 28
+        body.append(
+            "<tr>"
+            f'<td><span class="timer-object">May {day}, 2025 - 18:00</span></td>'
+            '<td>S-Tier</td><td>Online</td><td><img src="/a.png"></td><td>Bo3</td>'
+            f'<td><a href="/counterstrike/Event_{i}" title="Event {i}">Event {i}</a></td>'
+            '<td><span class="flag"></span></td>'
+            f'<td><b>{2 - i % 2}</b> : <b>{i % 3}</b></td>'
+            f'<td><span class="team-template"><a href="/counterstrike/Team_{i}" title="Team {i}">T{i}</a></span></td>'
+            "</tr>"
+        )
+    table = f'<table class="wikitable wikitable-striped sortable">{header}{"".join(body)}</table>'
+    return _page(table, filler_blocks=600)
+
+
+def liquipedia_roster(players: int = 6) -> str:
+    rows = []
+    for i in range(players):
+        cls = "Player roster-coach" if i == players - 1 else "Player"
+        rows.append(
+            f'<tr class="{cls}"><td class="ID"><b><a href="/counterstrike/P{i}" title="P{i}">player{i}</a></b></td>'
+            f'<td class="Name">Name {i}</td><td class="Date">2024-01-0{i + 1}</td></tr>'
+        )
+    table = f'<table class="wikitable wikitable-striped roster-card">{"".join(rows)}</table>'
+    return _page(table, filler_blocks=1200)
+
+
+def bo3_scoreboard(rows: int = 10) -> str:
+    parts = []
+    for i in range(rows):
+        parts.append(
+            '<div class="table-row">'
+            f'<div class="table-cell nickname"><span class="nickname">player{i}</span></div>'
+            f'<div class="table-cell kills"><p class="value">{20 + i}</p></div>'
+            f'<div class="table-cell deaths"><p class="value">{15 + i}</p></div>'
+            f'<div class="table-cell assists"><p class="value">{3 + i}</p></div>'
+            f'<div class="table-cell adr"><p class="value">{80 + i}.5</p></div>'
+            f'<span class="c-table-cell-score__value">{6 + i / 10:.1f}</span>'
+            "</div>"
+        )
+    parts.append('<div class="table-row total"><span class="nickname">Total</span></div>')
+    return _page(f'<div class="c-table">{"".join(parts)}</div>', filler_blocks=1200)
+
+
+def draft5_upcoming(days: int = 5, per_day: int = 2) -> str:
+    parts = []
+    for d in range(days):
+        parts.append(f'<p class="MatchList__MatchListDate-sc-1pio0qc-0">📅 {10 + d}/06/2025</p>')
+        for m in range(per_day):
+            parts.append(
+                '<a class="MatchCardSimple__MatchContainer-sc-wcmxha-0" href="/partida/1">'
+                f'<small class="MatchCardSimple__MatchTime-sc-wcmxha-3">{12 + m}:00</small>'
+                '<div class="MatchCardSimple__MatchTeam-sc-wcmxha-11"><span>FURIA</span>'
+                '<div class="MatchCardSimple__Score-sc-wcmxha-15">0</div></div>'
+                f'<div class="MatchCardSimple__MatchTeam-sc-wcmxha-11"><span>Team {d}{m}</span>'
+                '<div class="MatchCardSimple__Score-sc-wcmxha-15">0</div></div>'
+                '<div class="MatchCardSimple__Badge-sc-wcmxha-18">MD3</div>'
+                '<div class="MatchCardSimple__Tournament-sc-wcmxha-34">Major</div>'
+                "</a>"
+            )
+    # outra seção da página com cards sem data (ex.: resultados recentes)
+    recent = (
+        '<section class="RecentResults"><h2>Resultados</h2>'
+        '<a class="MatchCardSimple__MatchContainer-sc-wcmxha-0" href="/partida/2">'
+        '<small class="MatchCardSimple__MatchTime-sc-wcmxha-3">20:00</small>'
+        '<div class="MatchCardSimple__MatchTeam-sc-wcmxha-11"><span>FURIA</span>'
+        '<div class="MatchCardSimple__Score-sc-wcmxha-15">2</div></div>'
+        '<div class="MatchCardSimple__MatchTeam-sc-wcmxha-11"><span>Old Rival</span>'
+        '<div class="MatchCardSimple__Score-sc-wcmxha-15">1</div></div>'
+        '<div class="MatchCardSimple__Badge-sc-wcmxha-18">MD3</div>'
+        '<div class="MatchCardSimple__Tournament-sc-wcmxha-34">Cup</div>'
+        "</a></section>"
+    )
+    return _page(f'<div class="MatchList">{"".join(parts)}</div>{recent}', filler_blocks=800)
+
+
+def draft5_upcoming_raw(days: int = 5, per_day: int = 2) -> str:
+    """HTML servido pelo draft5.gg antes da hidratação: a agenda vem no `__NEXT_DATA__`."""
+    matches = []
+    for d in range(days):
+        for m in range(per_day):
+            matches.append({
+                "matchId": d * 10 + m,
+                # 10/06/2025 12:00 BRT + d dias + m horas
+                "matchDate": 1749567600 + d * 86400 + m * 3600,
+                "teamA": {"teamId": 330, "teamName": "FURIA"},
+                "teamB": {"teamId": 4000 + d * 10 + m, "teamName": f"Team {d}{m}"},
+                "seriesScoreA": 0,
+                "seriesScoreB": 0,
+                "bestOf": 3,
+                "tournament": {"tournamentName": "Major"},
+            })
+    payload = {"props": {"pageProps": {"team": {"teamId": 330}, "matches": matches}}, "page": "/equipe/[slug]"}
+    script = f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(payload)}</script>'
+    return _page(f'<div id="__next"></div>{script}', filler_blocks=200)
+
+
+def pandascore_live(matches: int = 3) -> str:
+    # a última partida é da line masculina e a penúltima da feminina
+    furia = {matches - 1: (124530, "FURIA"), matches - 2: (125999, "FURIA fe")}
+    data = []
+    for i in range(matches):
+        data.append({
+            "id": 1000 + i,
+            "live": {"round": 7 + i, "supported": True},
+            "scores": {"1": 4 + i, "2": 3},
+            "opponents": [
+                {"opponent": {"id": 2000 + i, "name": f"Team {i}"}},
+                {"opponent": {"id": 3000 + i, "name": f"Rival {i}"}},
+            ],
+        })
+        if i in furia:
+            team_id, name = furia[i]
+            data[-1]["opponents"][1] = {"opponent": {"id": team_id, "name": name}}
+    return json.dumps(data)
+
+
+GENERATORS = {
+    "liquipedia_matches": liquipedia_matches,
+    "liquipedia_roster": liquipedia_roster,
+    "bo3_scoreboard": bo3_scoreboard,
+    "draft5_upcoming": draft5_upcoming,
+    "draft5_upcoming_raw": draft5_upcoming_raw,
+    "pandascore_live": pandascore_live,
+}
+EXTENSIONS = {"pandascore_live": ".json"}
+
+
+def load_fixture(name: str) -> str:
+    """Resposta gravada em `fixtures/<name>.html|.json`, ou a versão sintética."""
+    recorded = FIXTURES_DIR / f"{name}{EXTENSIONS.get(name, '.html')}"
+    if recorded.exists():
+        return recorded.read_text(encoding="utf-8")
+    return GENERATORS[name]()
@@ -0,0 +1,74 @@
+"""
+Grava respostas reais dos upstreams em `benchmarks/fixtures/` para que os
+benchmarks rodem offline com páginas de verdade.
+
+    PANDASCORE_TOKEN=... python benchmarks/record_fixtures.py [--bo3-url URL]
+"""
+import argparse
+import asyncio
+import os
+
+import httpx
+
+from fixtures import EXTENSIONS, FIXTURES_DIR
+
+HEADERS = {
+    "User-Agent": "FuriaResultsBot/1.0",
+    "Referer": "https://liquipedia.net/counterstrike/FURIA",
+}
+SOURCES = {
+    "liquipedia_matches": "https://liquipedia.net/counterstrike/FURIA/Matches?action=render",
+    "liquipedia_roster": "https://liquipedia.net/counterstrike/FURIA?action=render",
+    "pandascore_live": "https://api.pandascore.co/csgo/matches/live",
+    # HTML servido antes da hidratação (caminho rápido, sem browser)
+    "draft5_upcoming_raw": "https://draft5.gg/equipe/330-FURIA/proximas-partidas",
+}
+DRAFT5_URL = "https://draft5.gg/equipe/330-FURIA/proximas-partidas"
+
+
+def save(name: str, body: str) -> None:
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    path = FIXTURES_DIR / f"{name}{EXTENSIONS.get(name, '.html')}"
+    path.write_text(body, encoding="utf-8")
+    print(f"✅ {name}: {len(body) // 1024} KB -> {path}")
+
+
+async def record_draft5() -> None:
+    # HTML renderizado no browser (fallback do scraper)
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.goto(DRAFT5_URL)
+        await page.wait_for_selector("p.MatchList__MatchListDate-sc-1pio0qc-0", timeout=10000)
+        save("draft5_upcoming", await page.content())
+        await browser.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bo3-url", help="página de partida do bo3.gg a gravar")
+    args = parser.parse_args()
+
+    sources = dict(SOURCES)
+    if args.bo3_url:
+        sources["bo3_scoreboard"] = args.bo3_url
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=20, follow_redirects=True) as client:
+        for name, url in sources.items():
+            params = {"token": os.getenv("PANDASCORE_TOKEN", "")} if name == "pandascore_live" else None
+            resp = await client.get(url, params=params)
+            resp.raise_for_status()
+            save(name, resp.text)
+            # etiqueta do Liquipedia: no máximo 1 requisição a cada 2 s
+            await asyncio.sleep(2)
+
+    try:
+        await record_draft5()
+    except Exception as e:
+        print(f"⚠️ draft5 não gravado: {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
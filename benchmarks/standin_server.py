@@ -0,0 +1,97 @@
+"""
+Servidor HTTP local que responde no lugar dos upstreams (Liquipedia,
+bo3.gg, draft5.gg e PandaScore) com as fixtures de `fixtures.py`.
+
+Os serviços apontam para ele via `UPSTREAM_BASE_URL`. Como os upstreams
+reais, manda ETag/Last-Modified, responde 304 a GETs condicionais e
+comprime com gzip quando pedido.
+"""
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+from fixtures import load_fixture
+
+# prefixo do path -> (fixture, content-type); a primeira regra que casar vence
+ROUTES = [
+    ("/counterstrike/", "/Matches", "liquipedia_matches", "text/html; charset=utf-8"),
+    ("/counterstrike/", "", "liquipedia_roster", "text/html; charset=utf-8"),
+    ("/matches/", "", "bo3_scoreboard", "text/html; charset=utf-8"),
+    ("/equipe/", "", "draft5_upcoming_raw", "text/html; charset=utf-8"),
+    ("/csgo/matches/live", "", "pandascore_live", "application/json"),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    bodies: Dict[str, bytes] = {}
+    gzipped: Dict[str, bytes] = {}
+    etags: Dict[str, str] = {}
+    delay: float = 0.0
+    hits: Dict[str, int] = {}
+
+    def _resolve(self):
+        path = self.path.split("?", 1)[0]
+        for prefix, contains, name, content_type in ROUTES:
+            if path.startswith(prefix) and contains in path:
+                return name, content_type
+        return None, None
+
+    def _respond(self, with_body: bool) -> None:
+        name, content_type = self._resolve()
+        if self.delay:
+            time.sleep(self.delay)
+        if name is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        self.hits[name] = self.hits.get(name, 0) + 1
+        etag = self.etags[name]
+        if self.headers.get("If-None-Match") == etag:
+            self.hits[f"{name}:304"] = self.hits.get(f"{name}:304", 0) + 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = self.bodies[name]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Tue, 10 Jun 2025 12:00:00 GMT")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.gzipped[name]
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self._respond(with_body=True)
+
+    def do_HEAD(self) -> None:
+        self._respond(with_body=False)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def start_server(delay_ms: float = 0.0, port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Sobe o servidor numa thread; devolve (server, base_url)."""
+    _Handler.bodies = {name: load_fixture(name).encode("utf-8") for _, _, name, _ in ROUTES}
+    _Handler.gzipped = {name: gzip.compress(body) for name, body in _Handler.bodies.items()}
+    _Handler.etags = {name: f'"{hashlib.md5(body).hexdigest()}"' for name, body in _Handler.bodies.items()}
+    _Handler.delay = delay_ms / 1000
+    _Handler.hits = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}"
+
+
+def upstream_hits() -> Dict[str, int]:
+    """Quantas requisições cada fixture recebeu."""
+    return dict(_Handler.hits)
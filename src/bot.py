@@ -1,19 +1,69 @@
+import startup  # primeiro: inicia o relógio do cold start
+
+import asyncio
 import os
 import logging
+import signal
 from dotenv import load_dotenv
-from telegram.ext import ApplicationBuilder, CommandHandler, CallbackQueryHandler
-from handlers import (
-    start,
-    help_command,
-    button_handler,
-    start_live,
-    stop_live,
-    round_nav_handler
-)
 
-# Load environment variables
+# Load environment variables (antes dos serviços, que leem tokens no import)
 load_dotenv()
+
+with startup.timed("telegram.ext"):
+    from telegram import Update
+    from telegram.ext import (
+        Application,
+        ApplicationBuilder,
+        CommandHandler,
+        CallbackQueryHandler,
+        PollAnswerHandler
+    )
+with startup.timed("handlers"):
+    from handlers import (
+        start,
+        help_command,
+        button_handler,
+        start_live,
+        stop_live,
+        round_nav_handler,
+        cheer_optin,
+        poll_answer_handler,
+        restore_live_subscriptions,
+        flush_live_store,
+        flush_cheer_polls,
+        live_store,
+        HEAVY_MODULES,
+        LIVE_FLUSH_INTERVAL,
+        CHEER_FLUSH_INTERVAL
+    )
+with startup.timed("services"):
+    from outbound import OutboundRateLimiter, outbox
+    from update_pipeline import BoundedUpdateQueue, ChatOrderedUpdateProcessor, latency_summary
+    from services.browser_pool import browser_pool
+    from services.cheer_polls import cheer_polls
+    from services.http_client import close_clients, start_clients
+    from services.loop_guard import run_blocking, start_watchdog, stop_watchdog
+    from services.metrics import start_metrics_server, stop_metrics_server
+    from services.shared_cache import shared_cache
+    from services.sharding import SHARD_INDEX, SHARDS
+startup.mark("imports")
+
 TOKEN = os.getenv("BOT_TOKEN")
+# "polling" (padrão) ou "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+PORT = int(os.getenv("PORT", "8443"))
+# Updates processadas em paralelo e limite de updates pendentes (backpressure)
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "64"))
+UPDATE_QUEUE_SIZE = int(os.getenv("UPDATE_QUEUE_SIZE", "1000"))
+# Aquecimento de cache guiado pela agenda de partidas
+PREFETCH = os.getenv("PREFETCH", "1") == "1"
+# Endpoint local /metrics (formato Prometheus)
+METRICS = os.getenv("METRICS", "1") == "1"
+# Carrega scrapers e parsers em background logo após o polling começar
+WARMUP = os.getenv("WARMUP", "1") == "1"
 
 # Logging configuration
 logging.basicConfig(
@@ -22,22 +72,128 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Main (Run Bot)
-def main():
-    logging.info("Seu Bot está Vivo!!")
-    app = ApplicationBuilder().token(TOKEN).build()
+# Lifecycle hooks
+async def log_pipeline_latency(context) -> None:
+    stats = latency_summary()
+    if stats["count"]:
+        logger.info(
+            "Latência update→resposta: p50 %.0f ms, p95 %.0f ms, p99 %.0f ms (%d updates)",
+            stats["p50_ms"], stats["p95_ms"], stats["p99_ms"], stats["count"]
+        )
+
+async def on_startup(app) -> None:
+    start_watchdog()
+    start_clients()
+    if METRICS:
+        await start_metrics_server()
+    app.job_queue.run_repeating(log_pipeline_latency, interval=60, first=60)
+    restore_live_subscriptions(app.job_queue)
+    app.job_queue.run_repeating(flush_live_store, interval=LIVE_FLUSH_INTERVAL)
+    votes = cheer_polls.load()
+    logger.info("Enquetes de torcida: %d votos restaurados", votes)
+    app.job_queue.run_repeating(flush_cheer_polls, interval=CHEER_FLUSH_INTERVAL)
+    # roda quando o job queue sobe, ou seja, com o bot já recebendo updates;
+    # o Chromium só é usado como fallback do draft5.gg e sobe no primeiro uso
+    app.job_queue.run_once(warm_up, when=0, name="startup:warmup")
+    startup.mark("post_init")
+
+async def warm_up(context) -> None:
+    startup.mark("polling")
+    if WARMUP:
+        # imports em thread: o event loop segue respondendo enquanto carregam
+        await run_blocking(startup.import_modules, HEAVY_MODULES)
+    if PREFETCH:
+        from prefetch import schedule_prefetch
+        schedule_prefetch(context.job_queue)
+    startup.mark("warm")
+    startup.report()
+
+async def on_shutdown(app) -> None:
+    await outbox.stop()
+    live_store.close()
+    cheer_polls.close()
+    await browser_pool.close()
+    await stop_watchdog()
+    await stop_metrics_server()
+    await close_clients()
+    if shared_cache is not None:
+        shared_cache.close()
+
+def build_application(updater: bool = True) -> Application:
+    builder = (
+        ApplicationBuilder()
+        .token(TOKEN)
+        .concurrent_updates(ChatOrderedUpdateProcessor(CONCURRENT_UPDATES))
+        .update_queue(BoundedUpdateQueue(UPDATE_QUEUE_SIZE))
+        .rate_limiter(OutboundRateLimiter())
+        .post_init(on_startup)
+        .post_shutdown(on_shutdown)
+    )
+    if not updater:
+        # worker do modo multi-processo: as updates chegam pelo router
+        builder = builder.updater(None)
+    app = builder.build()
 
     # Command handlers
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("help", help_command))
     app.add_handler(CommandHandler("live", start_live))
     app.add_handler(CommandHandler("stoplive", stop_live))
+    app.add_handler(CommandHandler("torcida", cheer_optin))
+
+    # Cheer poll votes (no chat attached: handled by shard 0 in sharded mode)
+    app.add_handler(PollAnswerHandler(poll_answer_handler))
 
     # CallbackQueryHandlers
-    app.add_handler(CallbackQueryHandler(button_handler))
+    # round navigation first: button_handler takes every other callback
     app.add_handler(CallbackQueryHandler(round_nav_handler, pattern="^(prev_round|next_round)$"))
+    app.add_handler(CallbackQueryHandler(button_handler))
+    return app
+
+# Worker (modo multi-processo, iniciado pelo router.py)
+def run_shard(updates) -> None:
+    """Atende as updates do shard SHARD_INDEX, lidas da fila `updates` (None encerra)."""
+    # Ctrl+C chega a todo o grupo de processos: quem encerra os workers é o router
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.info("Shard %d/%d no ar", SHARD_INDEX, SHARDS)
+    asyncio.run(_serve_shard(build_application(updater=False), updates))
+
+async def _serve_shard(app: Application, updates) -> None:
+    # mesma sequência do run_polling: initialize, post_init, start ... stop, shutdown, post_shutdown
+    loop = asyncio.get_running_loop()
+    await app.initialize()
+    await on_startup(app)
+    await app.start()
+    try:
+        while (data := await loop.run_in_executor(None, updates.get)) is not None:
+            # a ordem da fila é a ordem do getUpdates; o processor mantém a ordem por chat
+            await app.update_queue.put(Update.de_json(data, app.bot))
+    finally:
+        await app.stop()
+        await app.shutdown()
+        await on_shutdown(app)
+
+# Main (Run Bot)
+def main():
+    logging.info("Seu Bot está Vivo!!")
+    if SHARDS > 1:
+        from router import run_router
+        if BOT_MODE == "webhook":
+            logger.warning("Modo multi-processo usa long polling; BOT_MODE=webhook ignorado")
+        return run_router(SHARDS, run_shard)
 
-    app.run_polling()
+    app = build_application()
+    if BOT_MODE == "webhook":
+        app.run_webhook(
+            listen="0.0.0.0",
+            port=PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL.rstrip('/')}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            max_connections=min(100, CONCURRENT_UPDATES),
+        )
+    else:
+        app.run_polling()
 
 if __name__ == "__main__":
     main()
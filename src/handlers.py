@@ -1,193 +1,534 @@
-import os
-from typing import Optional, Dict, Any
+import hashlib
+import logging
+import time
+from typing import Optional, Dict, Any, List, Tuple
 
 import httpx
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardMarkup
 from telegram.constants import ChatAction
 from telegram.ext import ContextTypes
-from telegram.error import BadRequest
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from telegram.error import BadRequest, Forbidden
 
 from markups import (
+    HELP_TEXT,
+    INVALID_OPTION_TEXT,
+    LINE_SWITCHED_TEXT,
+    POLL_SENT_TEXT,
+    SOCIALS_MENUS,
+    SOCIALS_TEXT,
+    STATS_MENU_TEXT,
+    WELCOME_TEXT,
+    cheer_markup,
+    live_round_markup,
     main_menu_markup,
-    stats_menu_markup,
-    socials_female_menu_markup,
-    socials_menu_markup,
-    socials_male_menu_markup
+    markup_fingerprint,
+    next_match_markup,
+    stats_menu_markup
 )
-from services.last_scoreboard import build_bo3_url, get_furia_scoreboard
-from services.next_match import fetch_upcoming_matches
-from services.result_matcher import get_latest_match_info
-from services.roster_service import get_current_roster
+import startup
+from outbound import Priority, outbox
+from services import metrics
+from services.cheer_polls import (
+    DEFAULT_OPTIONS,
+    MAX_OPTIONS,
+    MIN_OPTIONS,
+    POLL_QUESTION,
+    cheer_polls
+)
+from services.live_cadence import IDLE_POLL_BASE, LIVE_POLL_INTERVAL, LiveCadence
+from services.live_status import fetch_live_matches, live_tracker, rate_limit
+from services.match_schedule import match_key, next_scheduled_start
+from services.subscription_store import DEFAULT_LINE, SubscriptionStore, create_store
+
+# Scrapers (BeautifulSoup/lxml, Playwright) and `prefetch` are imported on
+# first use so /start answers before they load; bot.py warms them up in the
+# background once polling has started.
+HEAVY_MODULES = (
+    "services.result_matcher",
+    "services.roster_service",
+    "services.last_scoreboard",
+    "services.next_match",
+    "prefetch",
+)
+
 
+logger = logging.getLogger(__name__)
 
 # --- Configuration & Constants ---
-PANDASCORE_TOKEN: str = os.getenv("PANDASCORE_TOKEN", "")
 HEADERS: Dict[str, str] = {
     'User-Agent': 'FuriaResultsBot/1.0',
     'Referer': 'https://liquipedia.net/counterstrike/FURIA'
 }
 TEAM_SLUG: str = 'FURIA'
+FEMALE_TEAM_SLUG: str = 'FURIA_Female'
 
-# Stores live states per chat_id
-live_states: Dict[int, Dict[str, Any]] = {}
+LIVE_JOB_NAME: str = "live_poller"
 
+# Adaptive cadence of the live poller; "busy" while a tick is running
+live_cadence = LiveCadence()
+live_poller: Dict[str, Any] = {"busy": False, "due": None}
 
-async def fetch_live_match() -> Optional[Dict[str, Any]]:
-    """
-    Fetch current live CS:GO match from PandaScore API.
-    Returns a dict with round, score, team1, team2 or None if no live match.
-    """
-    url = "https://api.pandascore.co/csgo/matches/live"
-    params = {"token": PANDASCORE_TOKEN}
+# --- Metrics ---
+KNOWN_CALLBACKS = {
+    "menu_socials", "socials_female", "socials_male", "toggle_line", "next_match",
+    "last_result", "menu_stats", "stats_top", "cheer_poll", "cheer_standings", "menu_main"
+}
+BUTTON_LATENCY = metrics.histogram(
+    "furia_button_latency_seconds", "Latência do button_handler por callback_data", ["callback"]
+)
+BUTTON_REQUESTS = metrics.counter(
+    "furia_button_requests_total", "Cliques por callback_data e resultado", ["callback", "status"]
+)
+LIVE_JOB_LAG = metrics.histogram(
+    "furia_live_job_lag_seconds", "Atraso do check_live em relação ao horário agendado",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+LIVE_TICK = metrics.histogram(
+    "furia_live_tick_seconds", "Duração de um tick do check_live (busca + fan-out)"
+)
+LIVE_SUBSCRIBERS = metrics.gauge("furia_live_subscribers", "Chats inscritos no /live")
+LIVE_POLL_INTERVAL_GAUGE = metrics.gauge(
+    "furia_live_poll_interval_seconds", "Cadência efetiva do poller do /live por partida", ["match_id"]
+)
 
-    async with httpx.AsyncClient(timeout=10) as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
 
-    if not data:
-        return None
+def collect_live_metrics() -> None:
+    LIVE_SUBSCRIBERS.set(len(live_states))
+    LIVE_POLL_INTERVAL_GAUGE.clear()
+    for match_id, interval in live_cadence.by_match.items():
+        LIVE_POLL_INTERVAL_GAUGE.set(interval, str(match_id))
+    if not live_cadence.by_match:
+        LIVE_POLL_INTERVAL_GAUGE.set(live_cadence.current, "none")
 
-    match = data[0]
-    return {
-        "round": match["live"]["round"],
-        "score": f"{match['scores']['1']}x{match['scores']['2']}",
-        "team1": match["opponents"][0]["opponent"]["name"],
-        "team2": match["opponents"][1]["opponent"]["name"]
-    }
 
+metrics.registry.add_collector(collect_live_metrics)
 
+# Stores live states per chat_id (persisted by the subscription store)
+live_store: SubscriptionStore = create_store()
+live_states: Dict[int, Dict[str, Any]] = live_store.states
+LIVE_FLUSH_INTERVAL: float = 2.0
+# A chat browsing past rounds goes back to live updates after this long idle
+ROUND_BROWSE_TIMEOUT: float = 120.0
+CHEER_FLUSH_INTERVAL: float = 10.0
 
 
 # --- Live Status Handlers ---
 async def start_live(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Begin periodic live match updates every 45 seconds."""
+    """Subscribe the chat to the shared live poller, for the user's selected line."""
     chat_id = update.effective_chat.id
-    state = live_states.setdefault(chat_id, {})
+    state = live_states.get(chat_id) or {}
 
     if state.get("status") == "active":
         await update.message.reply_text("🔴 Live status já ativo.")
         return
 
-    live_states[chat_id] = {"status": "active", "message_id": None, "round": None}
-    context.job_queue.run_repeating(
-        check_live, interval=45, first=0, chat_id=chat_id, name=str(chat_id)
+    female = context.user_data.get("female", False)
+    live_store.subscribe(chat_id, FEMALE_TEAM_SLUG if female else TEAM_SLUG)
+    ensure_live_poller(context.job_queue)
+    await update.message.reply_text(
+        "✅ Live status iniciado! Atualizações automáticas (a cada poucos segundos durante a partida)."
     )
-    await update.message.reply_text("✅ Live status iniciado! Atualizações a cada 45s.")
 
 
 async def stop_live(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Stop the live match updates and clear state."""
+    """Unsubscribe the chat; the poller stops when nobody is left."""
     chat_id = update.effective_chat.id
-    jobs = context.job_queue.get_jobs_by_name(str(chat_id))
 
-    if not jobs:
+    if not live_store.unsubscribe(chat_id):
         await update.message.reply_text("❌ Nenhum live ativo.")
         return
 
-    for job in jobs:
-        job.schedule_removal()
-    live_states.pop(chat_id, None)
+    if not live_states:
+        for job in context.job_queue.get_jobs_by_name(LIVE_JOB_NAME):
+            job.schedule_removal()
     await update.message.reply_text("🛑 Live status desativado.")
 
 
-async def check_live(context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Job callback to fetch live match and update or send message."""
-    job = context.job
-    chat_id = job.chat_id
-    state = live_states.get(chat_id)
+def ensure_live_poller(job_queue) -> None:
+    """
+    Start the live poller chain if it is not running yet.
 
-    # If deactivated
-    if not state or state.get("status") != "active":
-        job.schedule_removal()
+    A running chain is only pulled forward out of a long idle backoff; a
+    tick delayed by Retry-After or low PandaScore quota is left alone.
+    """
+    if live_poller["busy"]:
         return
+    jobs = job_queue.get_jobs_by_name(LIVE_JOB_NAME)
+    if jobs:
+        due = live_poller["due"]
+        if (
+            not live_cadence.idle
+            or live_cadence.throttled
+            or due is None
+            or due - time.monotonic() <= LIVE_POLL_INTERVAL
+        ):
+            return
+        # a subscriber is waiting: run the next tick now instead of after a long backoff
+        for job in jobs:
+            job.schedule_removal()
+    live_poller["due"] = time.monotonic()
+    job_queue.run_once(check_live, when=0, name=LIVE_JOB_NAME)
+
+
+def restore_live_subscriptions(job_queue) -> None:
+    """Reload persisted /live subscriptions and resume the poller."""
+    started = time.perf_counter()
+    count = live_store.load()
+    if count:
+        ensure_live_poller(job_queue)
+    logger.info(
+        "%d inscrições do live restauradas em %.0f ms",
+        count, (time.perf_counter() - started) * 1000
+    )
 
-    info = await fetch_live_match()
-    if not info:
-        await context.bot.send_message(chat_id, "❌ Falha ao obter dados ao vivo.")
+
+async def flush_live_store(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Job callback: persist pending live state changes in one batch."""
+    await live_store.flush()
+
+
+def follow_line(chat_id: int, line: str) -> None:
+    """Point an existing /live subscription at another line."""
+    state = live_states.get(chat_id)
+    if state is None or state.get("line") == line:
         return
+    state["line"] = line
+    # the next tick re-renders this chat with the new line's match
+    state["hash"] = None
+    live_store.touch(chat_id)
+
 
-    text = (
-        f"🔴 Live Round {info['round']}\n"
+def render_live_text(info: Optional[Dict[str, Any]]) -> str:
+    """Render the live status message shared by every chat following a line."""
+    if not info:
+        return "⚪ Nenhuma partida ao vivo no momento."
+    return (
+        f"🔴 Live Round {info['round'] if info['round'] is not None else '–'}\n"
         f"{info['team1']} vs {info['team2']}\n"
         f"Placar: {info['score']}"
     )
-    keyboard = InlineKeyboardMarkup([[
-        InlineKeyboardButton("⬅️ Anterior", callback_data="prev_round"),
-        InlineKeyboardButton("➡️ Próxima", callback_data="next_round"),
-    ]])
 
-    msg_id = state.get("message_id")
-    if msg_id:
-        try:
-            current_msg = await context.bot.get_message(chat_id, msg_id)
-        except Exception:
-            current_msg = None
 
-        if current_msg and current_msg.text == text and current_msg.reply_markup == keyboard:
-            return
+async def check_live(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Job callback: fetch the live list once, fan each FURIA line's match out
+    to the chats following that line and schedule the next tick according
+    to the adaptive cadence.
+    """
+    if not live_states:
+        return
 
-        await context.bot.edit_message_text(
-            text=text,
-            chat_id=chat_id,
-            message_id=msg_id,
-            reply_markup=keyboard
+    if live_poller["due"] is not None:
+        LIVE_JOB_LAG.observe(max(0.0, time.monotonic() - live_poller["due"]))
+    live_poller["busy"] = True
+    tick_start = time.perf_counter()
+    live: Dict[str, Dict[str, Any]] = {}
+    retry_after = None
+    try:
+        live = await fetch_live_matches()
+        live_tracker.update(live)
+        await fan_out_live(context.bot, live)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 429:
+            retry_after = rate_limit["retry_after"] or IDLE_POLL_BASE
+        logger.warning("PandaScore respondeu %s", e.response.status_code)
+    except Exception:
+        logger.exception("Falha ao obter dados ao vivo")
+    finally:
+        delay = live_cadence.next_delay(
+            live,
+            rate_limit_remaining=rate_limit["remaining"],
+            retry_after=retry_after,
+            next_start=next_scheduled_start()
         )
+        LIVE_TICK.observe(time.perf_counter() - tick_start)
+        live_poller["busy"] = False
+        if live_states:
+            live_poller["due"] = time.monotonic() + delay
+            context.job_queue.run_once(check_live, when=delay, name=LIVE_JOB_NAME)
+
+
+async def fan_out_live(bot, live: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Render each line's live match (`live`, keyed by line) and queue an edit
+    for every chat that is out of date with its line.
+
+    Delivery goes through the broadcast dispatcher: rate limits and RetryAfter
+    are handled by the bot's rate limiter, and an edit still queued from the
+    previous tick is replaced by this one instead of being sent twice.
+    """
+    keyboard = live_round_markup()
+    # line -> (text, hash), rendered once per line
+    renders: Dict[str, tuple] = {}
+
+    # Only chats whose last rendered message differs need an API call
+    targets = []
+    for chat_id, state in live_states.items():
+        if state.get("status") != "active":
+            continue
+        line = state.get("line", DEFAULT_LINE)
+        if state.get("round") is not None:
+            info = live.get(line)
+            if (
+                info is not None
+                and info.get("match_id") == state.get("round_match")
+                and time.monotonic() - state.get("round_at", 0.0) < ROUND_BROWSE_TIMEOUT
+            ):
+                # browsing past rounds: round_nav_handler owns the message
+                continue
+            # the browsed match ended, or the chat stopped browsing: back to live
+            state["round"] = None
+            live_store.touch(chat_id)
+        if line not in renders:
+            text = render_live_text(live.get(line))
+            renders[line] = (text, render_hash(text, keyboard))
+        if state.get("hash") != renders[line][1]:
+            targets.append((chat_id, *renders[line]))
+
+    for chat_id, text, rendered in targets:
+        outbox.submit(
+            ("live", chat_id),
+            lambda chat_id=chat_id, text=text, rendered=rendered: update_live_message(
+                bot, chat_id, text, keyboard, rendered
+            ),
+            _live_delivered
+        )
+
+
+def _live_delivered(key, result) -> None:
+    _, chat_id = key
+    if isinstance(result, Forbidden):
+        # bot was blocked or removed from the chat
+        live_store.unsubscribe(chat_id)
+    elif isinstance(result, BadRequest) and "message to edit not found" in str(result).lower():
+        # the user deleted the live message: the next tick sends a new one
+        state = live_states.get(chat_id)
+        if state is not None:
+            state["message_id"] = None
+            state["hash"] = None
+            live_store.touch(chat_id)
+    elif isinstance(result, Exception):
+        logger.warning("Falha ao atualizar live no chat %s: %r", chat_id, result)
+
+
+async def update_live_message(
+    bot,
+    chat_id: int,
+    text: str,
+    keyboard: InlineKeyboardMarkup,
+    rendered: str
+) -> None:
+    """Edit the chat's live message, or send it if there is none yet."""
+    state = live_states.get(chat_id)
+    if not state:
+        return
+
+    # Same text/markup as last time: zero API calls
+    if state.get("hash") == rendered:
+        return
+
+    msg_id = state.get("message_id")
+    if msg_id:
+        try:
+            await bot.edit_message_text(
+                text=text,
+                chat_id=chat_id,
+                message_id=msg_id,
+                reply_markup=keyboard,
+                rate_limit_args=Priority.BROADCAST
+            )
+        except BadRequest as e:
+            if "message is not modified" not in str(e).lower():
+                raise
     else:
-        msg = await context.bot.send_message(
+        msg = await bot.send_message(
             chat_id=chat_id,
             text=text,
-            reply_markup=keyboard
+            reply_markup=keyboard,
+            rate_limit_args=Priority.BROADCAST
         )
         state["message_id"] = msg.message_id
+    state["hash"] = rendered
+    live_store.touch(chat_id)
+
+
+def render_hash(text: str, keyboard: InlineKeyboardMarkup) -> str:
+    """Stable digest of a rendered message (text + inline keyboard)."""
+    digest = hashlib.blake2b(text.encode(), digest_size=8)
+    digest.update(markup_fingerprint(keyboard))
+    return digest.hexdigest()
 
 
 async def round_nav_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Handle manual navigation between rounds in the live status message."""
+    """
+    Move the chat's live message through the rounds recorded for its match.
+
+    Rounds come from the live tracker's in-memory history, so navigating
+    makes no upstream call. While the chat shows a past round the poller
+    leaves its message alone; stepping past the newest round resumes it, and
+    so do the match ending or `ROUND_BROWSE_TIMEOUT` without a click.
+    """
     query = update.callback_query
-    await query.answer()
     chat_id = query.message.chat.id
     state = live_states.get(chat_id)
+    match = live_tracker.match_for_line(state.get("line", DEFAULT_LINE)) if state else None
 
-    if not state:
+    if not match or not len(match["rounds"]):
+        await query.answer("⚪ Nenhuma partida ao vivo no momento.")
         return
+    await query.answer()
 
-    current = state.get("round", 1)
-    state["round"] = current + 1 if query.data == "next_round" else max(1, current - 1)
+    rounds = match["rounds"]
+    newest = rounds.latest()
+    target = rounds.step(state.get("round") or newest, 1 if query.data == "next_round" else -1)
+    state["round"] = None if target == newest else target
+    state["round_match"] = match["match_id"]
+    state["round_at"] = time.monotonic()
+    live_store.touch(chat_id)
 
-    await query.edit_message_text(
-        text=f"🔄 Rodada manual: {state['round']}",
-        reply_markup=query.message.reply_markup
+    if state["round"] is None:
+        text = render_live_text(match["info"])
+    else:
+        text = render_round_text(match["info"], rounds.get(target))
+    keyboard = live_round_markup()
+    rendered = render_hash(text, keyboard)
+    # already showing it (e.g. "previous" on the oldest round kept)
+    if state.get("hash") == rendered:
+        return
+
+    await query.edit_message_text(text=text, reply_markup=keyboard)
+    state["hash"] = rendered
+
+
+def render_round_text(info: Dict[str, Any], snapshot: tuple) -> str:
+    """Render a past round of the live match from its recorded snapshot."""
+    round_num, score1, score2 = snapshot
+    return (
+        f"⏪ Round {round_num} (ao vivo: {info['round'] if info['round'] is not None else '–'})\n"
+        f"{info['team1']} vs {info['team2']}\n"
+        f"Placar: {score1}x{score2}"
     )
 
 
+# --- Cheer Poll (favorite player) ---
+async def cheer_options(team_slug: str) -> Tuple[str, List[str]]:
+    """
+    Match key and poll options for the line.
+
+    Options built from the roster are pinned for the match in the shared
+    store, so every worker sends the same list; if another worker pinned
+    first, its list wins. When the roster is unavailable (or too short for
+    a poll) the default options are used for this send only, and the next
+    send tries the roster again.
+    """
+    key = match_key(team_slug)
+    options = await cheer_polls.match_options(key)
+    if options is not None:
+        return key, options
+
+    from services.roster_service import get_current_roster
+
+    try:
+        roster = await get_current_roster(team_slug)
+    except Exception as e:
+        logger.warning("Roster indisponível para a enquete de %s: %r", team_slug, e)
+        roster = []
+    if len(roster) < MIN_OPTIONS:
+        return key, DEFAULT_OPTIONS
+    return key, await cheer_polls.pin_options(key, roster[:MAX_OPTIONS])
+
 
-# --- User Poll for Favorite Player ---
 async def send_cheer_poll(
     chat_id: int,
     bot,
     team_slug: str = TEAM_SLUG
 ) -> None:
-    """Send a non-anonymous poll asking which player will shine."""
-    try:
-        options = await get_current_roster(team_slug)
-    except Exception as e:
-        options = []
-        await bot.send_message(chat_id, f"❌ Ocorreu um erro: {e}. Usando lista padrão de jogadores.")
-
-    if not options:
-        options = ["yuurih", "KSCERATO", "FalleN", "molodoy", "YEKINDAR"]
-
-    await bot.send_poll(
+    """Send the line's cheer poll (non-anonymous, so answers are tallied)."""
+    key, options = await cheer_options(team_slug)
+    message = await bot.send_poll(
         chat_id=chat_id,
-        question="Quem vai brilhar hoje? 🌟",
+        question=POLL_QUESTION,
         options=options,
         is_anonymous=False,
         allows_multiple_answers=False
     )
+    if getattr(message, "poll", None) is not None:
+        cheer_polls.register(message.poll.id, key, options)
+
+
+async def broadcast_cheer_poll(bot, team_slug: str) -> int:
+    """
+    Queue the line's cheer poll for every opted-in chat.
+
+    Options are resolved once for the whole broadcast; delivery goes
+    through the broadcast dispatcher at `Priority.BROADCAST`, so menu
+    clicks keep priority while thousands of polls go out. Returns how
+    many were queued.
+    """
+    key, options = await cheer_options(team_slug)
+    chats = cheer_polls.chats_for(team_slug)
+    for chat_id in chats:
+        outbox.submit(
+            ("poll", chat_id),
+            lambda chat_id=chat_id: bot.send_poll(
+                chat_id=chat_id,
+                question=POLL_QUESTION,
+                options=options,
+                is_anonymous=False,
+                allows_multiple_answers=False,
+                rate_limit_args=Priority.BROADCAST
+            ),
+            lambda queued, result: _poll_delivered(queued, result, key, options)
+        )
+    return len(chats)
+
+
+def _poll_delivered(queued, result, key: str, options: List[str]) -> None:
+    _, chat_id = queued
+    if isinstance(result, Forbidden):
+        cheer_polls.opt_out(chat_id)
+    elif isinstance(result, Exception):
+        logger.warning("Falha ao enviar enquete ao chat %s: %r", chat_id, result)
+    elif getattr(result, "poll", None) is not None:
+        cheer_polls.register(result.poll.id, key, options)
+
+
+async def poll_answer_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Tally a cheer poll vote (new, changed or retracted) in memory."""
+    answer = update.poll_answer
+    cheer_polls.record_answer(answer.poll_id, answer.user.id, answer.option_ids)
+
+
+async def cheer_optin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Toggle the chat's subscription to the pre-match cheer poll broadcast."""
+    chat_id = update.effective_chat.id
+    if cheer_polls.opt_out(chat_id):
+        await update.message.reply_text("🔕 Você não vai mais receber a enquete de torcida.")
+        return
+
+    female = context.user_data.get("female", False)
+    cheer_polls.opt_in(chat_id, FEMALE_TEAM_SLUG if female else TEAM_SLUG)
+    await update.message.reply_text(
+        "🔔 Pronto! A enquete de torcida chega aqui antes de cada partida "
+        f"da line {'feminina' if female else 'masculina'}."
+    )
 
 
+async def render_cheer_standings(team_slug: str) -> str:
+    """Global standings of the line's current cheer poll, across all chats."""
+    standings = await cheer_polls.shared_standings(match_key(team_slug))
+    total = sum(votes for _, votes in standings)
+    if not total:
+        return "📊 Ainda não há votos na enquete de torcida desta partida."
+    lines = [f"📊 Parcial da Torcida ({total} votos)"]
+    for nick, votes in standings:
+        lines.append(f"• {nick}: {votes} ({votes * 100 // total}%)")
+    return "\n".join(lines)
+
+
+async def flush_cheer_polls(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Job callback: persist cheer poll changes in one batch."""
+    await cheer_polls.flush()
 
 
 # --- Command Handlers ---
@@ -195,21 +536,37 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Send welcome message and show main menu."""
     context.user_data.setdefault("female", False)
     await update.message.reply_text(
-        "🔥 Bem-vindo fã da FURIA! 💥 Escolha uma opção:",
+        WELCOME_TEXT,
         reply_markup=main_menu_markup(context.user_data["female"])
     )
+    startup.mark("first_reply")
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Display help information."""
-    help_text = (
-        "/start - Acessar menu principal\n"
-        "/live(beta) - Status de partidas ao vivo via PandaScore\n"
-    )
-    await update.message.reply_text(help_text)
+    await update.message.reply_text(HELP_TEXT)
 
 async def button_handler(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Handle all inline button callbacks, recording latency per branch."""
+    data = update.callback_query.data
+    label = data if data in KNOWN_CALLBACKS else "other"
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        await dispatch_button(update, context)
+    except Exception:
+        status = "error"
+        raise
+    finally:
+        BUTTON_LATENCY.observe(time.perf_counter() - start, label)
+        BUTTON_REQUESTS.inc(label, status)
+
+
+async def dispatch_button(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Handle all inline button callbacks from the main menu."""
     query = update.callback_query
@@ -221,7 +578,7 @@ async def button_handler(
 
     data = query.data
     female = context.user_data.get("female", False)
-    team_slug = "FURIA_Female" if female else TEAM_SLUG
+    team_slug = FEMALE_TEAM_SLUG if female else TEAM_SLUG
     # Draft5 slug
     draft_slug = "1200-FURIA-fem" if female else "330-FURIA"
 
@@ -233,31 +590,29 @@ async def button_handler(
     if data == "toggle_line":
         female = not female
         context.user_data["female"] = female
-        label = "feminina" if female else "masculina"
+        follow_line(query.message.chat_id, FEMALE_TEAM_SLUG if female else TEAM_SLUG)
         return await query.edit_message_text(
-            text=f"✅ Agora usando a line {label}!",
+            text=LINE_SWITCHED_TEXT[female],
             reply_markup=main_menu_markup(female),
             parse_mode="Markdown"
         )
 
     # Next match
     if data == "next_match":
-        # retry twice on timeout
-        upcoming = []
-        for _ in range(2):
+        from services.next_match import fetch_upcoming_matches
+
+        # timeouts are retried with jitter inside the fetcher; an open circuit
+        # fails fast and the cache serves the last known schedule when it has one
+        try:
+            upcoming = await fetch_upcoming_matches(draft_slug)
+        except Exception:
             try:
-                upcoming = await fetch_upcoming_matches(draft_slug)
-                break
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                try:
-                    return await query.edit_message_text(
-                        "❌ Erro ao buscar próximas partidas.",
-                        reply_markup=main_menu_markup(female)
-                    )
-                except BadRequest:
-                    return
+                return await query.edit_message_text(
+                    "❌ Erro ao buscar próximas partidas.",
+                    reply_markup=main_menu_markup(female)
+                )
+            except BadRequest:
+                return
 
         if not upcoming:
             try:
@@ -279,21 +634,19 @@ async def button_handler(
     
         text = "\n\n".join(lines)
 
-        keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🔄 Atualizar", callback_data="next_match")],
-            [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
-        ])
         try:
             return await query.edit_message_text(
                 text=text,
-                reply_markup=keyboard
+                reply_markup=next_match_markup()
             )
         except BadRequest:
             return
 
     # Last result
     if data == "last_result":
-        latest = get_latest_match_info(team_slug, HEADERS)
+        from services.result_matcher import get_latest_match_info
+
+        latest = await get_latest_match_info(team_slug, HEADERS)
         if latest:
             text = (
                 f"🏆 Último Resultado 🏆\n"
@@ -315,25 +668,29 @@ async def button_handler(
     # Statistics menu
     if data == "menu_stats":
         return await query.edit_message_text(
-            "📊 Estatísticas – escolha:",
+            STATS_MENU_TEXT,
             reply_markup=stats_menu_markup()
         )
 
     # Top fragger stats
     if data == "stats_top":
+        from services.last_scoreboard import build_bo3_urls, get_latest_scoreboard
+        from services.result_matcher import get_latest_match_info
+
         dynamic_headers = {
             'User-Agent': 'FuriaResultsBot/1.0',
             'Referer': f'https://liquipedia.net/counterstrike/{team_slug}'
         }
-        url = build_bo3_url(team_slug, dynamic_headers)
+        latest = await get_latest_match_info(team_slug, dynamic_headers)
+        urls = build_bo3_urls(team_slug, latest) if latest else []
 
-        if not url:
+        if not urls:
             return await query.edit_message_text(
                 "❌ Não foi possível gerar a URL do jogo.",
                 reply_markup=main_menu_markup(female)
             )
 
-        board = get_furia_scoreboard(url)
+        board = await get_latest_scoreboard(team_slug, latest, urls)
         if not board:
             return await query.edit_message_text(
                 "❌ Não encontrei o placar dos jogadores.",
@@ -369,22 +726,27 @@ async def button_handler(
         )
         return await context.bot.send_message(
             chat_id=update.effective_chat.id,
-            text="🎮 Enquete enviada!",
-            reply_markup=main_menu_markup(female)
+            text=POLL_SENT_TEXT,
+            reply_markup=cheer_markup()
+        )
+
+    # Cheer poll standings (all chats, from memory)
+    if data == "cheer_standings":
+        return await query.edit_message_text(
+            await render_cheer_standings(team_slug),
+            reply_markup=cheer_markup()
         )
 
     # Return to main menu
     if data == "menu_main":
         return await query.edit_message_text(
-            "🔥 Bem-vindo fã da FURIA! 💥 Escolha uma opção:",
+            WELCOME_TEXT,
             reply_markup=main_menu_markup(female)
         )
-    
-    # TODO: Insert URL https://bo3.gg
-    
+
     # Unknown callback
     await query.edit_message_text(
-        "❓ Opção inválida.",
+        INVALID_OPTION_TEXT,
         reply_markup=main_menu_markup(female)
     )
 
@@ -397,14 +759,5 @@ async def socials_button_handler(
     query = update.callback_query
     await query.answer()
 
-    if query.data == "socials_female":
-        text = "🌟 Redes Sociais da Line Feminina:"
-        markup = socials_female_menu_markup()
-    elif query.data == "socials_male":
-        text = "🔥 Redes Sociais da Line Masculina:"
-        markup = socials_male_menu_markup()
-    else:
-        text = "Escolha uma rede social:"
-        markup = socials_menu_markup()
-
-    await query.edit_message_text(text=text, reply_markup=markup)
+    key = query.data if query.data in SOCIALS_MENUS else "menu_socials"
+    await query.edit_message_text(text=SOCIALS_TEXT[key], reply_markup=SOCIALS_MENUS[key])
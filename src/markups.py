@@ -1,7 +1,72 @@
+from typing import Any, Dict, List
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
-# Main Menu
-def main_menu_markup(female: bool) -> InlineKeyboardMarkup:
+# All keyboards and menu texts are built once at import and shared by every
+# handler. Telegram objects are immutable, so reusing them is safe; each
+# prebuilt markup also keeps its serialized form and its render fingerprint.
+
+
+class PrebuiltMarkup(InlineKeyboardMarkup):
+    """InlineKeyboardMarkup that caches its `to_dict()` and render fingerprint."""
+
+    __slots__ = ("_as_dict", "_fingerprint")
+
+    def __init__(self, inline_keyboard: List[List[InlineKeyboardButton]]) -> None:
+        super().__init__(inline_keyboard)
+        with self._unfrozen():
+            self._as_dict = super().to_dict()
+            self._fingerprint = _fingerprint(self)
+
+    def to_dict(self, recursive: bool = True) -> Dict[str, Any]:
+        if not recursive:
+            return super().to_dict(recursive=False)
+        # shallow copy: callers may add keys, nested values are never mutated
+        return dict(self._as_dict)
+
+    @property
+    def fingerprint(self) -> bytes:
+        return self._fingerprint
+
+
+def _fingerprint(markup: InlineKeyboardMarkup) -> bytes:
+    return b"".join(
+        f"\x00{button.text}\x01{button.callback_data or button.url}".encode()
+        for row in markup.inline_keyboard
+        for button in row
+    )
+
+
+def markup_fingerprint(markup: InlineKeyboardMarkup) -> bytes:
+    """Byte fingerprint of a keyboard's buttons (precomputed for prebuilt ones)."""
+    if isinstance(markup, PrebuiltMarkup):
+        return markup.fingerprint
+    return _fingerprint(markup)
+
+
+# --- Menu texts ---
+WELCOME_TEXT = "🔥 Bem-vindo fã da FURIA! 💥 Escolha uma opção:"
+HELP_TEXT = (
+    "/start - Acessar menu principal\n"
+    "/live(beta) - Status de partidas ao vivo via PandaScore\n"
+    "/torcida - Receber (ou parar de receber) a enquete de torcida antes das partidas\n"
+)
+STATS_MENU_TEXT = "📊 Estatísticas – escolha:"
+INVALID_OPTION_TEXT = "❓ Opção inválida."
+POLL_SENT_TEXT = "🎮 Enquete enviada!"
+LINE_SWITCHED_TEXT: Dict[bool, str] = {
+    False: "✅ Agora usando a line masculina!",
+    True: "✅ Agora usando a line feminina!",
+}
+SOCIALS_TEXT: Dict[str, str] = {
+    "menu_socials": "Escolha uma rede social:",
+    "socials_female": "🌟 Redes Sociais da Line Feminina:",
+    "socials_male": "🔥 Redes Sociais da Line Masculina:",
+}
+
+
+# --- Builders (run once, at import) ---
+def _build_main_menu(female: bool) -> PrebuiltMarkup:
     toggle_label = (
         "🔄 Ir para Line Feminina ♀️🏳️‍🌈" if not female
         else "🔄 Ir para Line Masculina ♂️"
@@ -16,61 +81,106 @@ def main_menu_markup(female: bool) -> InlineKeyboardMarkup:
         [InlineKeyboardButton("💬 Fale no WhatsApp (beta)", url="https://wa.me/5511993404466")],
         [InlineKeyboardButton("🌐 Redes Sociais", callback_data="menu_socials")]
     ]
-    return InlineKeyboardMarkup(keyboard)
+    return PrebuiltMarkup(keyboard)
 
 
-# Statistics Menu
-def stats_menu_markup() -> InlineKeyboardMarkup:
+def _build_stats_menu() -> PrebuiltMarkup:
     keyboard = [
         [InlineKeyboardButton("🥇 Top Fragger", callback_data="stats_top")],
         [InlineKeyboardButton("📈 Win Rate", callback_data="stats_wr")],
         [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")],
     ]
-    return InlineKeyboardMarkup(keyboard)
+    return PrebuiltMarkup(keyboard)
 
 
-# General Social Media Menu
-def socials_menu_markup() -> InlineKeyboardMarkup:
+def _build_socials_menu(suffix: str = "") -> PrebuiltMarkup:
     keyboard = [
         [
-            InlineKeyboardButton("📸 Instagram", url="https://www.instagram.com/furiagg"),
-            InlineKeyboardButton("🐦 Twitter", url="https://twitter.com/FURIA"),
+            InlineKeyboardButton(f"📸 Instagram{suffix}", url="https://www.instagram.com/furiagg"),
+            InlineKeyboardButton(f"🐦 Twitter{suffix}", url="https://twitter.com/FURIA"),
         ],
         [
-            InlineKeyboardButton("🎵 TikTok", url="https://www.tiktok.com/@furiagg"),
-            InlineKeyboardButton("▶️ YouTube", url="https://www.youtube.com/@FURIA"),
+            InlineKeyboardButton(f"🎵 TikTok{suffix}", url="https://www.tiktok.com/@furiagg"),
+            InlineKeyboardButton(f"▶️ YouTube{suffix}", url="https://www.youtube.com/@FURIA"),
         ],
         [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
     ]
-    return InlineKeyboardMarkup(keyboard)
+    return PrebuiltMarkup(keyboard)
+
+
+def _build_next_match_menu() -> PrebuiltMarkup:
+    return PrebuiltMarkup([
+        [InlineKeyboardButton("🔄 Atualizar", callback_data="next_match")],
+        [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
+    ])
+
+
+def _build_cheer_menu() -> PrebuiltMarkup:
+    return PrebuiltMarkup([
+        [InlineKeyboardButton("📊 Parcial da Torcida", callback_data="cheer_standings")],
+        [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
+    ])
+
+
+def _build_live_round_nav() -> PrebuiltMarkup:
+    return PrebuiltMarkup([[
+        InlineKeyboardButton("⬅️ Anterior", callback_data="prev_round"),
+        InlineKeyboardButton("➡️ Próxima", callback_data="next_round"),
+    ]])
+
+
+MAIN_MENU: Dict[bool, PrebuiltMarkup] = {
+    False: _build_main_menu(False),
+    True: _build_main_menu(True),
+}
+STATS_MENU = _build_stats_menu()
+SOCIALS_MENU = _build_socials_menu()
+SOCIALS_FEMALE_MENU = _build_socials_menu(" (Feminina)")
+SOCIALS_MALE_MENU = _build_socials_menu(" (Masculina)")
+NEXT_MATCH_MENU = _build_next_match_menu()
+CHEER_MENU = _build_cheer_menu()
+LIVE_ROUND_NAV = _build_live_round_nav()
+SOCIALS_MENUS: Dict[str, PrebuiltMarkup] = {
+    "menu_socials": SOCIALS_MENU,
+    "socials_female": SOCIALS_FEMALE_MENU,
+    "socials_male": SOCIALS_MALE_MENU,
+}
+
+
+# Main Menu
+def main_menu_markup(female: bool) -> InlineKeyboardMarkup:
+    return MAIN_MENU[bool(female)]
+
+
+# Statistics Menu
+def stats_menu_markup() -> InlineKeyboardMarkup:
+    return STATS_MENU
+
+
+# General Social Media Menu
+def socials_menu_markup() -> InlineKeyboardMarkup:
+    return SOCIALS_MENU
 
 
 # Social Media Menu for Female Line
 def socials_female_menu_markup() -> InlineKeyboardMarkup:
-    keyboard = [
-        [
-            InlineKeyboardButton("📸 Instagram (Feminina)", url="https://www.instagram.com/furiagg"),
-            InlineKeyboardButton("🐦 Twitter (Feminina)", url="https://twitter.com/FURIA"),
-        ],
-        [
-            InlineKeyboardButton("🎵 TikTok (Feminina)", url="https://www.tiktok.com/@furiagg"),
-            InlineKeyboardButton("▶️ YouTube (Feminina)", url="https://www.youtube.com/@FURIA"),
-        ],
-        [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    return SOCIALS_FEMALE_MENU
 
 # Social Media Menu for Male Line
 def socials_male_menu_markup() -> InlineKeyboardMarkup:
-    keyboard = [
-        [
-            InlineKeyboardButton("📸 Instagram (Masculina)", url="https://www.instagram.com/furiagg"),
-            InlineKeyboardButton("🐦 Twitter (Masculina)", url="https://twitter.com/FURIA"),
-        ],
-        [
-            InlineKeyboardButton("🎵 TikTok (Masculina)", url="https://www.tiktok.com/@furiagg"),
-            InlineKeyboardButton("▶️ YouTube (Masculina)", url="https://www.youtube.com/@FURIA"),
-        ],
-        [InlineKeyboardButton("🔙 Voltar", callback_data="menu_main")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    return SOCIALS_MALE_MENU
+
+
+# Next match view
+def next_match_markup() -> InlineKeyboardMarkup:
+    return NEXT_MATCH_MENU
+
+
+# After a cheer poll (global standings)
+def cheer_markup() -> InlineKeyboardMarkup:
+    return CHEER_MENU
+
+
+# Live status message (round navigation)
+def live_round_markup() -> InlineKeyboardMarkup:
+    return LIVE_ROUND_NAV
@@ -0,0 +1,276 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Coroutine, Deque, Dict, Hashable, List, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from services import metrics
+from services.sharding import SHARDS
+
+logger = logging.getLogger(__name__)
+
+# Limites do Bot API: ~30 mensagens/s no total, ~1/s por chat privado e
+# ~20/min por grupo. Rajadas curtas por chat são toleradas.
+# No modo multi-processo o limite do bot é dividido entre os workers.
+GLOBAL_RATE: float = float(os.getenv("OUTBOUND_GLOBAL_RATE", "30")) / SHARDS
+PRIVATE_CHAT_INTERVAL: float = 1.0
+GROUP_CHAT_INTERVAL: float = 3.0
+CHAT_BURST: int = 3
+MAX_RETRIES: int = 3
+# Envios de broadcast executados em paralelo pelo dispatcher
+BROADCAST_WORKERS: int = int(os.getenv("OUTBOUND_WORKERS", "32"))
+
+JSONResult = Union[bool, Dict[str, Any], List[Dict[str, Any]]]
+
+
+class Priority(IntEnum):
+    """Prioridade de um request; passe como `rate_limit_args` nos métodos do bot."""
+    INTERACTIVE = 0
+    BROADCAST = 1
+
+
+OUTBOUND_REQUESTS = metrics.counter(
+    "furia_outbound_requests_total", "Requests ao Bot API por prioridade", ["priority"]
+)
+OUTBOUND_WAIT = metrics.histogram(
+    "furia_outbound_wait_seconds", "Espera no rate limiter antes de chamar o Bot API", ["priority"]
+)
+RETRY_AFTERS = metrics.counter("furia_outbound_retry_after_total", "RetryAfter recebidos do Telegram")
+COALESCED = metrics.counter(
+    "furia_outbound_coalesced_total", "Envios de broadcast substituídos por um mais novo antes de sair"
+)
+BROADCAST_PENDING = metrics.gauge("furia_outbound_pending", "Envios de broadcast na fila do dispatcher")
+
+
+class PriorityTokenBucket:
+    """
+    Balde de fichas em que quem espera é atendido por prioridade (e FIFO
+    dentro da mesma prioridade): respostas interativas passam na frente
+    do broadcast assim que há ficha.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, priority: int) -> None:
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._release())
+        await future
+
+    async def _release(self) -> None:
+        while self._waiters:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            _, _, future = heapq.heappop(self._waiters)
+            # quem desistiu (cancelado) não gasta ficha
+            if not future.done():
+                self._tokens -= 1
+                future.set_result(None)
+
+
+class OutboundRateLimiter(BaseRateLimiter[Priority]):
+    """
+    Rate limiter de todos os requests do bot (plugado no `ApplicationBuilder`).
+
+    - Balde global com prioridade: `Priority.INTERACTIVE` (padrão) antes de
+      `Priority.BROADCAST`.
+    - Espaçamento por chat (GCRA), mais folgado em grupos.
+    - `RetryAfter` tratado aqui: pausa todos os envios pelo tempo pedido e
+      repete o request, até `MAX_RETRIES` vezes.
+    """
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, max_retries: int = MAX_RETRIES) -> None:
+        # sem rajada global: o Telegram conta envios por janela de 1 s
+        self._global = PriorityTokenBucket(global_rate, 1)
+        self._max_retries = max_retries
+        # chat_id -> instante teórico de chegada do próximo envio (GCRA)
+        self._chat_tat: Dict[Hashable, float] = {}
+        self._paused_until = 0.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        self._chat_tat.clear()
+
+    async def _wait_chat(self, chat_id: Any) -> None:
+        interval = GROUP_CHAT_INTERVAL if _is_group(chat_id) else PRIVATE_CHAT_INTERVAL
+        now = time.monotonic()
+        tat = max(self._chat_tat.get(chat_id, now), now) + interval
+        self._chat_tat[chat_id] = tat
+        wait = tat - CHAT_BURST * interval - now
+        if len(self._chat_tat) > 10_000:
+            self._prune(now)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _prune(self, now: float) -> None:
+        for chat_id in [c for c, tat in self._chat_tat.items() if tat < now]:
+            del self._chat_tat[chat_id]
+
+    async def _wait_pause(self) -> None:
+        while (remaining := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, JSONResult]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Priority],
+    ) -> JSONResult:
+        priority = Priority.INTERACTIVE if rate_limit_args is None else rate_limit_args
+        chat_id = data.get("chat_id")
+        label = priority.name.lower()
+        OUTBOUND_REQUESTS.inc(label)
+
+        for attempt in range(self._max_retries + 1):
+            start = time.monotonic()
+            await self._wait_pause()
+            if chat_id is not None:
+                await self._wait_chat(chat_id)
+            await self._global.acquire(priority)
+            OUTBOUND_WAIT.observe(time.monotonic() - start, label)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                RETRY_AFTERS.inc()
+                retry_after = _seconds(e.retry_after)
+                if attempt == self._max_retries:
+                    logger.warning("RetryAfter em %s após %d tentativas", endpoint, attempt + 1)
+                    raise
+                logger.info("RetryAfter de %.1f s em %s; pausando envios", retry_after, endpoint)
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after + 0.1)
+        raise AssertionError("unreachable")
+
+
+def _is_group(chat_id: Any) -> bool:
+    # ids negativos (ou @username) são grupos, supergrupos e canais
+    if isinstance(chat_id, str):
+        return not chat_id.lstrip("-").isdigit() or chat_id.startswith("-")
+    return isinstance(chat_id, int) and chat_id < 0
+
+
+def _seconds(value: Any) -> float:
+    return value.total_seconds() if hasattr(value, "total_seconds") else float(value)
+
+
+class BroadcastDispatcher:
+    """
+    Fila de envios em massa (live, enquetes) com coalescência por chave.
+
+    Se um envio para a mesma chave (ex.: o chat_id da mensagem de live)
+    ainda não saiu, o novo substitui o antigo: só o texto mais recente é
+    enviado. Os envios devem chamar o bot com `Priority.BROADCAST`, para o
+    rate limiter deixar as respostas interativas passarem na frente.
+    """
+
+    def __init__(self, workers: int = BROADCAST_WORKERS) -> None:
+        self.workers = workers
+        self._order: Deque[Hashable] = deque()
+        self._pending: Dict[Hashable, Tuple[Callable[[], Awaitable[Any]], Optional[Callable]]] = {}
+        self._ready: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active = 0
+
+    def submit(
+        self,
+        key: Hashable,
+        send: Callable[[], Awaitable[Any]],
+        on_done: Optional[Callable[[Hashable, Any], None]] = None,
+    ) -> None:
+        """
+        Agenda `send()` para `key`. `on_done(key, resultado_ou_exceção)` é
+        chamado quando o envio termina (não é chamado se for substituído).
+        """
+        self._start()
+        if key in self._pending:
+            COALESCED.inc()
+        else:
+            self._order.append(key)
+        self._pending[key] = (send, on_done)
+        BROADCAST_PENDING.set(len(self._pending))
+        self._idle.clear()
+        self._ready.set()
+
+    def _start(self) -> None:
+        if self._tasks:
+            return
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self) -> None:
+        while True:
+            if not self._order:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            key = self._order.popleft()
+            send, on_done = self._pending.pop(key)
+            BROADCAST_PENDING.set(len(self._pending))
+            self._active += 1
+            try:
+                result = await send()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                result = e
+            finally:
+                self._active -= 1
+            if on_done is not None:
+                try:
+                    on_done(key, result)
+                except Exception:
+                    logger.exception("Falha no callback do envio %r", key)
+            elif isinstance(result, Exception):
+                logger.warning("Falha no envio %r: %r", key, result)
+            if not self._order and not self._active:
+                self._idle.set()
+
+    async def drain(self) -> None:
+        """Espera a fila esvaziar e os envios em andamento terminarem."""
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def stop(self) -> None:
+        """Descarta o que falta enviar e encerra os workers."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._order.clear()
+        self._pending.clear()
+
+
+outbox = BroadcastDispatcher()
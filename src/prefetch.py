@@ -0,0 +1,164 @@
+import datetime
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+from telegram.ext import ContextTypes
+
+from services.last_scoreboard import build_bo3_urls, get_latest_scoreboard
+from services.match_schedule import BRT, scheduled_starts
+from services.next_match import fetch_upcoming_matches
+from services.result_matcher import get_latest_match_info, sync_match_history
+from services.roster_service import get_current_roster
+from services.sharding import SHARD_INDEX
+
+logger = logging.getLogger(__name__)
+
+# (slug do Liquipedia, slug do draft5) de cada line
+LINES: List[Tuple[str, str]] = [
+    ("FURIA", "330-FURIA"),
+    ("FURIA_Female", "1200-FURIA-fem"),
+]
+
+SCHEDULE_INTERVAL: int = 30 * 60
+# Modo multi-processo: só o shard 0 busca a agenda e aquece os caches; os
+# demais leem a agenda do cache compartilhado um pouco depois
+SCHEDULE_OWNER: bool = SHARD_INDEX == 0
+SCHEDULE_FOLLOWER_DELAY: int = 60
+# Aquece o roster antes da janela da enquete de torcida
+ROSTER_LEAD = datetime.timedelta(minutes=45)
+# Duração estimada por mapa e refreshes depois do fim (o Liquipedia atualiza com atraso)
+MAP_DURATION = datetime.timedelta(minutes=60)
+POST_MATCH_DELAYS = [datetime.timedelta(minutes=m) for m in (0, 15, 45)]
+# Enquete de torcida enviada aos chats inscritos antes do início
+CHEER_POLL_LEAD = datetime.timedelta(minutes=30)
+
+MONTHS: Dict[str, int] = {
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12,
+}
+
+
+def parse_match_start(
+    date_text: str,
+    time_text: str,
+    now: Optional[datetime.datetime] = None
+) -> Optional[datetime.datetime]:
+    """
+    Converte a data/hora de um card do draft5.gg ("Hoje", "Amanhã",
+    "14/06", "14/06/2025", "Sábado, 14 de junho") em datetime de Brasília.
+    """
+    now = now or datetime.datetime.now(BRT)
+    time_match = re.search(r"(\d{1,2}):(\d{2})", time_text)
+    if not time_match:
+        return None
+    hour, minute = map(int, time_match.groups())
+
+    text = date_text.lower()
+    if "hoje" in text:
+        day = now.date()
+    elif "amanhã" in text or "amanha" in text:
+        day = now.date() + datetime.timedelta(days=1)
+    else:
+        numeric = re.search(r"(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?", text)
+        named = re.search(r"(\d{1,2}) de ([a-zç]{3})", text)
+        if numeric:
+            d, m, y = numeric.groups()
+            year = int(y) + (2000 if y and len(y) == 2 else 0) if y else now.year
+            d, m = int(d), int(m)
+        elif named and named.group(2) in MONTHS:
+            d, m, year = int(named.group(1)), MONTHS[named.group(2)], now.year
+        else:
+            return None
+        try:
+            day = datetime.date(year, m, d)
+        except ValueError:
+            return None
+        # sem ano explícito: datas "no passado" são do ano que vem
+        if not (numeric and numeric.group(3)) and day < now.date() - datetime.timedelta(days=1):
+            day = day.replace(year=year + 1)
+
+    return datetime.datetime.combine(day, datetime.time(hour, minute), tzinfo=BRT)
+
+
+def _maps(best_of: str) -> int:
+    found = re.search(r"(\d)", best_of or "")
+    return int(found.group(1)) if found else 3
+
+
+async def warm_roster(context: ContextTypes.DEFAULT_TYPE) -> None:
+    team_slug = context.job.data
+    await get_current_roster.refresh(team_slug)
+
+
+async def warm_results(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Atualiza o último resultado e já resolve o scoreboard do bo3.gg."""
+    team_slug = context.job.data
+    headers = {
+        'User-Agent': 'FuriaResultsBot/1.0',
+        'Referer': f'https://liquipedia.net/counterstrike/{team_slug}'
+    }
+    await sync_match_history.refresh(team_slug, headers)
+    latest = await get_latest_match_info(team_slug, headers)
+    urls = build_bo3_urls(team_slug, latest) if latest else []
+    if urls:
+        await get_latest_scoreboard(team_slug, latest, urls, refresh=True)
+
+
+async def broadcast_poll(context: ContextTypes.DEFAULT_TYPE) -> None:
+    from handlers import broadcast_cheer_poll
+
+    sent = await broadcast_cheer_poll(context.bot, context.job.data)
+    logger.info("Enquete de torcida de %s enfileirada para %d chats", context.job.data, sent)
+
+
+def _schedule_once(job_queue, callback, when: datetime.datetime, name: str, data: str) -> None:
+    if when <= datetime.datetime.now(BRT) or job_queue.get_jobs_by_name(name):
+        return
+    job_queue.run_once(callback, when=when, name=name, data=data)
+
+
+async def refresh_schedule(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Job periódico: lê a agenda das duas lines e agenda os aquecimentos
+    de cache antes e depois de cada partida (só no shard dono da agenda)
+    e a enquete de torcida (em todos: cada um envia para os seus chats).
+    """
+    job_queue = context.job_queue
+    fetch = fetch_upcoming_matches.refresh if SCHEDULE_OWNER else fetch_upcoming_matches
+    for team_slug, draft_slug in LINES:
+        try:
+            upcoming = await fetch(draft_slug)
+        except Exception as e:
+            logger.warning("Prefetch: falha ao ler agenda de %s: %r", draft_slug, e)
+            continue
+
+        starts = []
+        for match in upcoming or []:
+            start = parse_match_start(match['date'], match['time'])
+            if not start:
+                continue
+            starts.append(start)
+            key = f"{team_slug}:{start.isoformat()}"
+            _schedule_once(job_queue, broadcast_poll, start - CHEER_POLL_LEAD, f"cheer_poll:{key}", team_slug)
+            if not SCHEDULE_OWNER:
+                continue
+
+            _schedule_once(job_queue, warm_roster, start - ROSTER_LEAD, f"prefetch:roster:{key}", team_slug)
+            end = start + MAP_DURATION * _maps(match.get('best_of', ''))
+            for i, delay in enumerate(POST_MATCH_DELAYS):
+                _schedule_once(
+                    job_queue, warm_results, end + delay, f"prefetch:results:{i}:{key}", team_slug
+                )
+        scheduled_starts[team_slug] = sorted(starts)
+
+
+def schedule_prefetch(job_queue) -> None:
+    """Agenda a leitura periódica da agenda e aquece o cache no startup."""
+    first = 5 if SCHEDULE_OWNER else 5 + SCHEDULE_FOLLOWER_DELAY
+    job_queue.run_repeating(refresh_schedule, interval=SCHEDULE_INTERVAL, first=first, name="prefetch:schedule")
+    if not SCHEDULE_OWNER:
+        return
+    for team_slug, _ in LINES:
+        job_queue.run_once(warm_roster, when=1, data=team_slug, name=f"prefetch:roster:startup:{team_slug}")
+        job_queue.run_once(warm_results, when=1, data=team_slug, name=f"prefetch:results:startup:{team_slug}")
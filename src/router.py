@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from typing import Callable, List, Optional
+
+from telegram import Bot, Update
+from telegram.error import NetworkError, RetryAfter, TimedOut
+
+from services.sharding import chat_id_of, shard_of
+
+logger = logging.getLogger(__name__)
+
+TOKEN = os.getenv("BOT_TOKEN")
+# Updates por shard aguardando o worker; cheia, o router para de ler (backpressure)
+ROUTER_QUEUE_SIZE: int = int(os.getenv("ROUTER_QUEUE_SIZE", "1000"))
+POLL_TIMEOUT: int = 30
+
+
+class ShardRouter:
+    """
+    Processo da frente do modo multi-processo.
+
+    Lê as updates do Telegram (long polling) e encaminha cada uma, crua, ao
+    worker dono do chat (`chat_id % shards`). Cada worker tem uma fila FIFO
+    e roda o bot completo (handlers, /live, rate limiter) só para os seus
+    chats, então a ordem por chat é mantida. Worker que cai é reiniciado
+    com a mesma fila. Inscrições do /live e o cache compartilhado ficam em
+    SQLite, visíveis a todos os workers.
+    """
+
+    def __init__(self, shards: int, target: Callable) -> None:
+        self.shards = shards
+        self.target = target
+        self._mp = multiprocessing.get_context("spawn")
+        self.queues = [self._mp.Queue(maxsize=ROUTER_QUEUE_SIZE) for _ in range(shards)]
+        self.workers: List[Optional[multiprocessing.Process]] = [None] * shards
+        self._stopping = asyncio.Event()
+
+    def _spawn(self, index: int) -> None:
+        # o worker (spawn) herda o os.environ do momento do start()
+        os.environ["SHARDS"] = str(self.shards)
+        os.environ["SHARD_INDEX"] = str(index)
+        try:
+            process = self._mp.Process(
+                target=self.target, args=(self.queues[index],), name=f"furia-shard-{index}"
+            )
+            process.start()
+        finally:
+            os.environ["SHARD_INDEX"] = "0"
+        self.workers[index] = process
+        logger.info("Worker %d iniciado (pid %d)", index, process.pid)
+
+    def _check_workers(self) -> None:
+        for index, process in enumerate(self.workers):
+            if not process.is_alive():
+                logger.warning("Worker %d saiu (código %s); reiniciando", index, process.exitcode)
+                self._spawn(index)
+
+    async def _route(self, update: Update) -> None:
+        data = update.to_dict()
+        chat_id = chat_id_of(data)
+        # updates sem chat (raras) vão para o shard 0
+        queue = self.queues[shard_of(chat_id, self.shards) if chat_id is not None else 0]
+        await asyncio.get_running_loop().run_in_executor(None, queue.put, data)
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+        for index in range(self.shards):
+            self._spawn(index)
+
+        offset = None
+        async with Bot(TOKEN) as bot:
+            await bot.delete_webhook()
+            while not self._stopping.is_set():
+                self._check_workers()
+                poll = asyncio.ensure_future(bot.get_updates(
+                    offset=offset, timeout=POLL_TIMEOUT, allowed_updates=Update.ALL_TYPES,
+                    read_timeout=POLL_TIMEOUT + 10
+                ))
+                stop = asyncio.ensure_future(self._stopping.wait())
+                await asyncio.wait((poll, stop), return_when=asyncio.FIRST_COMPLETED)
+                if not poll.done():
+                    poll.cancel()
+                    break
+                stop.cancel()
+                try:
+                    updates = poll.result()
+                except RetryAfter as e:
+                    delay = e.retry_after
+                    await asyncio.sleep(delay.total_seconds() if hasattr(delay, "total_seconds") else delay)
+                    continue
+                except (NetworkError, TimedOut) as e:
+                    logger.warning("getUpdates falhou: %r", e)
+                    await asyncio.sleep(1)
+                    continue
+                for update in updates:
+                    await self._route(update)
+                    offset = update.update_id + 1
+            if offset is not None:
+                # confirma o que já foi encaminhado, para não reprocessar no restart
+                await bot.get_updates(offset=offset, timeout=0)
+
+        await self.stop()
+
+    async def stop(self) -> None:
+        loop = asyncio.get_running_loop()
+        for queue in self.queues:
+            await loop.run_in_executor(None, queue.put, None)
+        for index, process in enumerate(self.workers):
+            await loop.run_in_executor(None, process.join, 30)
+            if process.is_alive():
+                logger.warning("Worker %d não encerrou a tempo; terminando", index)
+                process.terminate()
+
+
+def run_router(shards: int, target: Callable) -> None:
+    """Sobe `shards` workers (cada um executando `target(fila)`) e roteia as updates."""
+    logger.info("Modo multi-processo: %d shards", shards)
+    asyncio.run(ShardRouter(shards, target).run())
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE: int = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+HEALTH_CHECK_TIMEOUT: float = 2.0
+
+
+class BrowserPool:
+    """
+    Um único Chromium de longa duração com um conjunto limitado de páginas
+    reutilizáveis (cada uma em seu próprio contexto).
+
+    O tamanho da fila de páginas é o limite de concorrência: quem chega
+    quando todas estão em uso espera a próxima ser devolvida.
+    """
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = size
+        self._playwright: Optional["Playwright"] = None
+        self._browser: Optional["Browser"] = None
+        self._pages: Optional[asyncio.Queue] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Inicia o Chromium e reserva as vagas do pool."""
+        async with self._lock:
+            if self._pages is None:
+                # None = vaga livre, a página é criada sob demanda
+                self._pages = asyncio.Queue()
+                for _ in range(self.size):
+                    self._pages.put_nowait(None)
+            await self._ensure_browser()
+
+    async def close(self) -> None:
+        """Fecha todas as páginas, o browser e o Playwright."""
+        async with self._lock:
+            if self._pages is not None:
+                while not self._pages.empty():
+                    page = self._pages.get_nowait()
+                    if page is not None:
+                        await self._discard(page)
+                self._pages = None
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+    async def _ensure_browser(self) -> "Browser":
+        """Relança o Chromium se ele ainda não existe ou caiu."""
+        if self._browser is None or not self._browser.is_connected():
+            if self._playwright is None:
+                # import pesado: só quando o browser é realmente necessário
+                from playwright.async_api import async_playwright
+
+                self._playwright = await async_playwright().start()
+            logger.info("Iniciando Chromium do pool de páginas")
+            self._browser = await self._playwright.chromium.launch(headless=True)
+        return self._browser
+
+    async def _new_page(self) -> "Page":
+        async with self._lock:
+            browser = await self._ensure_browser()
+        context = await browser.new_context()
+        return await context.new_page()
+
+    async def _discard(self, page: "Page") -> None:
+        try:
+            await page.context.close()
+        except Exception:
+            pass
+
+    async def _is_healthy(self, page: "Page") -> bool:
+        if page.is_closed() or self._browser is None or not self._browser.is_connected():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), HEALTH_CHECK_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator["Page"]:
+        """
+        Empresta uma página saudável do pool. Páginas que falharam durante o
+        uso (ou no health check) são descartadas e recriadas na próxima vez.
+        """
+        if self._pages is None:
+            await self.start()
+        pages = self._pages
+
+        page = await pages.get()
+        healthy = False
+        try:
+            if page is not None and not await self._is_healthy(page):
+                logger.warning("Página do pool não respondeu, reciclando")
+                await self._discard(page)
+                page = None
+            if page is None:
+                page = await self._new_page()
+            yield page
+            healthy = True
+        finally:
+            if not healthy and page is not None:
+                await self._discard(page)
+                page = None
+            pages.put_nowait(page)
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,222 @@
+import asyncio
+import inspect
+import logging
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from services import metrics
+from services.loop_guard import run_blocking
+from services.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+_RAISE = object()
+
+CACHE_MAXSIZE: int = int(os.getenv("CACHE_MAXSIZE", "512"))
+
+# TTLs por fonte, em segundos: (fresco, tolerância stale-while-revalidate)
+SOURCE_TTLS: Dict[str, Tuple[float, float]] = {
+    "liquipedia_matches": (600, 6 * 3600),
+    "liquipedia_roster": (6 * 3600, 24 * 3600),
+    "draft5_upcoming": (300, 3600),
+    "bo3_scoreboard": (1800, 24 * 3600),
+}
+
+
+CACHE_REQUESTS = metrics.counter(
+    "furia_cache_requests_total",
+    "Consultas ao cache por fonte e resultado (hit, stale, coalesced, miss, fallback)",
+    ["source", "result"]
+)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class TTLCache:
+    """
+    Cache em memória com TTL, despejo LRU e single-flight.
+
+    - Enquanto a entrada está fresca, devolve direto.
+    - Na janela stale, devolve o valor antigo e agenda um refresh em background.
+    - Chamadas simultâneas para a mesma chave compartilham uma única busca.
+    - Se a busca falhar (ex.: circuito do host aberto), devolve a última
+      entrada conhecida, mesmo vencida, em vez do erro.
+    - No modo multi-processo, antes de buscar consulta o cache compartilhado
+      (`shared_cache`): o que outro worker buscou há pouco não é buscado de novo.
+    """
+
+    def __init__(self, maxsize: int = CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    def _count(self, source: str, kind: str) -> None:
+        CACHE_REQUESTS.inc(source, kind)
+
+    def _store(self, key: Hashable, value: Any, ttl: float, stale_ttl: float) -> None:
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+    ) -> asyncio.Task:
+        """Dispara (ou reaproveita) a busca em andamento para `key`."""
+        task = self._inflight.get(key)
+        if task is not None:
+            return task
+
+        async def run() -> Any:
+            try:
+                shared = await _shared_lookup(key)
+                if shared is not None:
+                    value, fresh_ttl, shared_stale_ttl = shared
+                    self._store(key, value, fresh_ttl, shared_stale_ttl)
+                    return value
+                value = await fetch()
+                # None indica falha silenciosa do scraper: não guardamos
+                if value is not None:
+                    self._store(key, value, ttl, stale_ttl)
+                    if shared_cache is not None:
+                        await run_blocking(shared_cache.put, key, value, ttl, stale_ttl)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.get_running_loop().create_task(run())
+        task.add_done_callback(_log_refresh_error)
+        self._inflight[key] = task
+        return task
+
+    async def get_or_fetch(
+        self,
+        key: Tuple[Hashable, ...],
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        source = key[0]
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self._count(source, "hit")
+                return entry.value
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self._count(source, "stale")
+                self._load(key, fetch, ttl, stale_ttl)
+                return entry.value
+
+        self._count(source, "coalesced" if key in self._inflight else "miss")
+        try:
+            # shield: um usuário que desiste não cancela a busca dos demais
+            return await asyncio.shield(self._load(key, fetch, ttl, stale_ttl))
+        except Exception:
+            if entry is None:
+                raise
+            self._count(source, "fallback")
+            return entry.value
+
+    async def refresh(
+        self,
+        key: Tuple[Hashable, ...],
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0.0,
+    ) -> Any:
+        """Força uma nova busca (coalescida) e atualiza a entrada."""
+        return await asyncio.shield(self._load(key, fetch, ttl, stale_ttl))
+
+    def invalidate(self, key: Tuple[Hashable, ...]) -> None:
+        self._entries.pop(key, None)
+
+
+async def _shared_lookup(key: Hashable) -> Optional[Tuple[Any, float, float]]:
+    """(valor, TTL fresco restante, tolerância stale) de uma entrada fresca do cache compartilhado."""
+    if shared_cache is None:
+        return None
+    entry = await run_blocking(shared_cache.get, key)
+    if entry is None:
+        return None
+    value, fresh_until, stale_until = entry
+    remaining = fresh_until - time.time()
+    if remaining <= 0:
+        return None
+    return value, remaining, stale_until - fresh_until
+
+
+def _log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Falha ao buscar dados para o cache: %r", task.exception())
+
+
+cache = TTLCache()
+
+
+def cached(source: str, ignore: Iterable[str] = (), on_error: Any = _RAISE) -> Callable:
+    """
+    Decora um fetcher async para passar pelo cache compartilhado.
+
+    A chave é `source` + os argumentos da chamada (com defaults aplicados),
+    exceto os listados em `ignore` (ex.: `headers`, que não é hashable).
+    Se `on_error` for passado, ele é devolvido quando a busca falha e não
+    há nada em cache, em vez de propagar a exceção.
+    O fetcher decorado ganha `.refresh(...)` e `.invalidate(...)`.
+    """
+    ttl, stale_ttl = SOURCE_TTLS[source]
+    ignored = set(ignore)
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+
+        def make_key(args: tuple, kwargs: dict) -> Tuple[Hashable, ...]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (source,) + tuple(
+                value for name, value in bound.arguments.items() if name not in ignored
+            )
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await cache.get_or_fetch(
+                    make_key(args, kwargs), lambda: func(*args, **kwargs), ttl, stale_ttl
+                )
+            except Exception:
+                if on_error is _RAISE:
+                    raise
+                return on_error
+
+        async def refresh(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await cache.refresh(
+                    make_key(args, kwargs), lambda: func(*args, **kwargs), ttl, stale_ttl
+                )
+            except Exception:
+                if on_error is _RAISE:
+                    raise
+                return on_error
+
+        def invalidate(*args: Any, **kwargs: Any) -> None:
+            cache.invalidate(make_key(args, kwargs))
+
+        wrapper.refresh = refresh
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
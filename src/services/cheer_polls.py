@@ -0,0 +1,295 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from services.loop_guard import run_blocking
+from services.sharding import SHARDS, owns
+
+logger = logging.getLogger(__name__)
+
+# ":memory:" mantém as enquetes só durante o processo (usado nos benchmarks)
+CHEER_POLLS_PATH: str = os.getenv("CHEER_POLLS_PATH", "data/cheer_polls.db")
+# Votos de enquetes ainda desconhecidas (ex.: enviadas por outro worker) esperam até aqui
+ORPHAN_TTL: float = 120.0
+
+POLL_QUESTION = "Quem vai brilhar hoje? 🌟"
+DEFAULT_OPTIONS = ["yuurih", "KSCERATO", "FalleN", "molodoy", "YEKINDAR"]
+# limites do Telegram para as opções de uma enquete
+MIN_OPTIONS = 2
+MAX_OPTIONS = 10
+
+_SEP = "\x1f"
+
+
+class CheerPolls:
+    """
+    Enquetes de torcida: chats inscritos no broadcast, opções de cada
+    partida e a apuração dos votos de todas as enquetes da partida.
+
+    Cada enquete guarda as opções com que foi enviada, e a apuração da
+    partida é por jogador: um voto na opção `i` de uma enquete conta para
+    o i-ésimo nome *daquela* enquete. Assim enquetes com listas diferentes
+    (elenco indisponível num envio, outro worker) continuam somando certo.
+    As opções tiradas do elenco são fixadas por partida direto no banco,
+    para todos os workers enviarem a mesma lista. Os votos individuais
+    ficam num dict (enquete, usuário) -> opção, para tratar troca e
+    retirada de voto. Tudo é servido da memória; `flush()` grava as
+    mudanças em lote no SQLite e `load()` reconstrói a apuração.
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS cheer_optin ("
+                " chat_id INTEGER PRIMARY KEY, line TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS cheer_matches ("
+                " match_key TEXT PRIMARY KEY, options TEXT NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS cheer_polls ("
+                " poll_id TEXT PRIMARY KEY, match_key TEXT NOT NULL, options TEXT);"
+                "CREATE TABLE IF NOT EXISTS cheer_votes ("
+                " poll_id TEXT NOT NULL, user_id INTEGER NOT NULL, option INTEGER NOT NULL,"
+                " PRIMARY KEY (poll_id, user_id));"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cheer_polls)")}
+            if "options" not in columns:
+                # bancos anteriores: as enquetes usavam as opções fixadas da partida
+                self._conn.execute("ALTER TABLE cheer_polls ADD COLUMN options TEXT")
+            self._conn.commit()
+
+        self.opted_in: Dict[int, str] = {}
+        self.options: Dict[str, List[str]] = {}
+        self.polls: Dict[str, Tuple[str, List[str]]] = {}
+        self.tallies: Dict[str, Dict[str, int]] = {}
+        self._answers: Dict[Tuple[str, int], int] = {}
+        self._orphans: List[Tuple[float, str, int, Tuple[int, ...]]] = []
+        self._dirty_optin: Set[int] = set()
+        self._dirty_polls: Set[str] = set()
+        self._dirty_votes: Set[Tuple[str, int]] = set()
+
+    # --- inscrições no broadcast ---
+    def opt_in(self, chat_id: int, line: str) -> None:
+        self.opted_in[chat_id] = line
+        self._dirty_optin.add(chat_id)
+
+    def opt_out(self, chat_id: int) -> bool:
+        if self.opted_in.pop(chat_id, None) is None:
+            return False
+        self._dirty_optin.add(chat_id)
+        return True
+
+    def chats_for(self, line: str) -> List[int]:
+        return [chat_id for chat_id, chat_line in self.opted_in.items() if chat_line == line]
+
+    # --- partidas e enquetes ---
+    async def match_options(self, match_key: str) -> Optional[List[str]]:
+        """Opções já fixadas para a partida, por este ou por outro worker."""
+        options = self.options.get(match_key)
+        if options is None:
+            options = await run_blocking(self._read_options, match_key)
+            if options is not None:
+                self.options[match_key] = options
+        return options
+
+    async def pin_options(self, match_key: str, options: Sequence[str]) -> List[str]:
+        """
+        Fixa as opções da partida no banco compartilhado e devolve as
+        vigentes: se outro worker fixou antes, vale a lista dele.
+        """
+        pinned = await run_blocking(self._pin, match_key, _SEP.join(options))
+        self.options[match_key] = pinned
+        return pinned
+
+    def _read_options(self, match_key: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT options FROM cheer_matches WHERE match_key = ?", (match_key,)
+            ).fetchone()
+        return row[0].split(_SEP) if row is not None else None
+
+    def _pin(self, match_key: str, options: str) -> List[str]:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cheer_matches (match_key, options) VALUES (?, ?)",
+                (match_key, options)
+            )
+            row = self._conn.execute(
+                "SELECT options FROM cheer_matches WHERE match_key = ?", (match_key,)
+            ).fetchone()
+        return row[0].split(_SEP)
+
+    def register(self, poll_id: str, match_key: str, options: Sequence[str]) -> None:
+        """Associa uma enquete enviada à partida e às opções com que foi enviada."""
+        self.polls[poll_id] = (match_key, list(options))
+        self.tallies.setdefault(match_key, {})
+        self._dirty_polls.add(poll_id)
+
+    def record_answer(self, poll_id: str, user_id: int, option_ids: Sequence[int]) -> bool:
+        """
+        Aplica um PollAnswer: voto novo, troca de voto ou retirada (lista
+        vazia). Devolve False se a enquete ainda não é conhecida; o voto
+        fica guardado e é reaplicado no próximo `flush()`.
+        """
+        poll = self.polls.get(poll_id)
+        if poll is None:
+            self._orphans.append((time.monotonic(), poll_id, user_id, tuple(option_ids)))
+            return False
+        match_key, options = poll
+        tally = self.tallies.setdefault(match_key, {})
+        previous = self._answers.pop((poll_id, user_id), None)
+        if previous is not None:
+            tally[options[previous]] -= 1
+        if option_ids and 0 <= option_ids[0] < len(options):
+            nick = options[option_ids[0]]
+            tally[nick] = tally.get(nick, 0) + 1
+            self._answers[(poll_id, user_id)] = option_ids[0]
+        self._dirty_votes.add((poll_id, user_id))
+        return True
+
+    def standings(self, match_key: str) -> List[Tuple[str, int]]:
+        """(jogador, votos) da partida, do mais votado ao menos votado."""
+        return _ranked(self.options.get(match_key, ()), self.tallies.get(match_key, {}))
+
+    async def shared_standings(self, match_key: str) -> List[Tuple[str, int]]:
+        """
+        Como `standings()`, mas no modo multi-processo soma os votos
+        gravados por todos os workers (com o atraso do `flush()`).
+        """
+        if SHARDS == 1:
+            return self.standings(match_key)
+        return await run_blocking(self._standings_from_db, match_key)
+
+    def _standings_from_db(self, match_key: str) -> List[Tuple[str, int]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT options FROM cheer_matches WHERE match_key = ?", (match_key,)
+            ).fetchone()
+            counts = self._conn.execute(
+                "SELECT COALESCE(p.options, m.options), v.option, COUNT(*) FROM cheer_votes v"
+                " JOIN cheer_polls p ON p.poll_id = v.poll_id"
+                " LEFT JOIN cheer_matches m ON m.match_key = p.match_key"
+                " WHERE p.match_key = ? GROUP BY p.poll_id, v.option",
+                (match_key,)
+            ).fetchall()
+        tally: Dict[str, int] = {}
+        for options, option, count in counts:
+            options = options.split(_SEP) if options else []
+            if 0 <= option < len(options):
+                tally[options[option]] = tally.get(options[option], 0) + count
+        return _ranked(row[0].split(_SEP) if row is not None else (), tally)
+
+    # --- persistência ---
+    def load(self) -> int:
+        """Recarrega inscrições, partidas e votos; devolve quantos votos."""
+        with self._lock:
+            optin = self._conn.execute("SELECT chat_id, line FROM cheer_optin").fetchall()
+            matches = self._conn.execute("SELECT match_key, options FROM cheer_matches").fetchall()
+            polls = self._conn.execute(
+                "SELECT p.poll_id, p.match_key, COALESCE(p.options, m.options) FROM cheer_polls p"
+                " LEFT JOIN cheer_matches m ON m.match_key = p.match_key"
+            ).fetchall()
+            votes = self._conn.execute("SELECT poll_id, user_id, option FROM cheer_votes").fetchall()
+        # no modo multi-processo cada worker faz o broadcast só para o seu shard
+        self.opted_in = {chat_id: line for chat_id, line in optin if owns(chat_id)}
+        self.options = {key: options.split(_SEP) for key, options in matches}
+        self.polls = {}
+        self.tallies = {}
+        self._answers = {}
+        for poll_id, match_key, options in polls:
+            if options is not None:
+                self.register(poll_id, match_key, options.split(_SEP))
+        self._dirty_polls.clear()
+        for poll_id, user_id, option in votes:
+            if poll_id in self.polls:
+                self.record_answer(poll_id, user_id, (option,))
+        self._dirty_votes.clear()
+        return len(self._answers)
+
+    def _take_changes(self) -> Tuple[list, list, list, list, list]:
+        optin = [(c, self.opted_in[c]) for c in self._dirty_optin if c in self.opted_in]
+        optout = [(c,) for c in self._dirty_optin if c not in self.opted_in]
+        polls = [(p, self.polls[p][0], _SEP.join(self.polls[p][1])) for p in self._dirty_polls]
+        votes = [(p, u, self._answers[(p, u)]) for p, u in self._dirty_votes if (p, u) in self._answers]
+        retracted = [(p, u) for p, u in self._dirty_votes if (p, u) not in self._answers]
+        for dirty in (self._dirty_optin, self._dirty_polls, self._dirty_votes):
+            dirty.clear()
+        return optin, optout, polls, votes, retracted
+
+    def _write(self, optin, optout, polls, votes, retracted) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO cheer_optin (chat_id, line) VALUES (?, ?)"
+                " ON CONFLICT(chat_id) DO UPDATE SET line=excluded.line", optin
+            )
+            self._conn.executemany("DELETE FROM cheer_optin WHERE chat_id = ?", optout)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO cheer_polls (poll_id, match_key, options) VALUES (?, ?, ?)",
+                polls
+            )
+            self._conn.executemany(
+                "INSERT INTO cheer_votes (poll_id, user_id, option) VALUES (?, ?, ?)"
+                " ON CONFLICT(poll_id, user_id) DO UPDATE SET option=excluded.option", votes
+            )
+            self._conn.executemany(
+                "DELETE FROM cheer_votes WHERE poll_id = ? AND user_id = ?", retracted
+            )
+
+    def _lookup_polls(self, poll_ids: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+        with self._lock:
+            polls = [
+                (poll_id, *row) for poll_id in poll_ids
+                if (row := self._conn.execute(
+                    "SELECT p.match_key, COALESCE(p.options, m.options) FROM cheer_polls p"
+                    " LEFT JOIN cheer_matches m ON m.match_key = p.match_key"
+                    " WHERE p.poll_id = ?", (poll_id,)
+                ).fetchone()) is not None
+            ]
+        return polls
+
+    async def flush(self) -> None:
+        changes = self._take_changes()
+        if any(changes):
+            await run_blocking(self._write, *changes)
+        if self._orphans:
+            await self._adopt_orphans()
+
+    async def _adopt_orphans(self) -> None:
+        """Reaplica votos de enquetes que outro worker registrou (ou descarta os velhos)."""
+        orphans, self._orphans = self._orphans, []
+        unknown = sorted({poll_id for _, poll_id, _, _ in orphans if poll_id not in self.polls})
+        for poll_id, match_key, options in await run_blocking(self._lookup_polls, unknown):
+            if options is not None:
+                self.register(poll_id, match_key, options.split(_SEP))
+                self._dirty_polls.discard(poll_id)
+        now = time.monotonic()
+        for received, poll_id, user_id, option_ids in orphans:
+            if poll_id in self.polls:
+                self.record_answer(poll_id, user_id, option_ids)
+            elif now - received < ORPHAN_TTL:
+                self._orphans.append((received, poll_id, user_id, option_ids))
+
+    def close(self) -> None:
+        changes = self._take_changes()
+        if any(changes):
+            self._write(*changes)
+        with self._lock:
+            self._conn.close()
+
+
+def _ranked(options: Sequence[str], tally: Dict[str, int]) -> List[Tuple[str, int]]:
+    """Opções fixadas (mesmo sem voto) e demais nomes votados, do mais ao menos votado."""
+    totals = dict.fromkeys(options, 0)
+    totals.update((nick, votes) for nick, votes in tally.items() if votes or nick in totals)
+    return sorted(totals.items(), key=lambda item: -item[1])
+
+
+cheer_polls = CheerPolls(CHEER_POLLS_PATH)
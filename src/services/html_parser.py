@@ -0,0 +1,61 @@
+import importlib.util
+import os
+import re
+from typing import Iterator, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Backend do BeautifulSoup: lxml (C, bem mais rápido) quando instalado,
+# senão o html.parser da stdlib. HTML_PARSER força um backend específico.
+PARSER_BACKEND: str = os.getenv("HTML_PARSER") or (
+    "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+)
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Cria o soup com o backend configurado. `parse_only` limita a árvore aos
+    elementos de interesse (o resto do documento é só tokenizado).
+    """
+    return BeautifulSoup(html, PARSER_BACKEND, parse_only=parse_only)
+
+
+def has_class(name: str) -> "re.Pattern[str]":
+    """
+    Matcher de classe para `SoupStrainer`: durante o parse o atributo chega
+    como string única ("wikitable roster-card"), então é preciso casar o token.
+    """
+    return re.compile(rf"(^|\s){re.escape(name)}(\s|$)")
+
+
+def slice_from(html: str, marker: str, tag: str) -> Optional[str]:
+    """
+    Recorta o documento a partir da tag `<tag` que contém `marker`
+    (ex.: a `<table` com class="wikitable"). None se o marcador não existe.
+    """
+    pos = html.find(marker)
+    if pos == -1:
+        return None
+    start = html.rfind(f"<{tag}", 0, pos)
+    return html[start if start != -1 else pos:]
+
+
+def iter_chunks(html: str, tag: str) -> Iterator[str]:
+    """
+    Divide o HTML em pedaços que começam em cada `<tag`, permitindo parsear
+    linha a linha e parar assim que a primeira linha válida aparecer.
+    """
+    opener = f"<{tag}"
+
+    def find(start: int) -> int:
+        pos = html.find(opener, start)
+        # ignora tags com o mesmo prefixo (ex.: <track> para "tr")
+        while pos != -1 and html[pos + len(opener):pos + len(opener) + 1] not in (" ", ">", "\n", "\t", "/"):
+            pos = html.find(opener, pos + len(opener))
+        return pos
+
+    pos = find(0)
+    while pos != -1:
+        nxt = find(pos + len(opener))
+        yield html[pos:nxt if nxt != -1 else len(html)]
+        pos = nxt
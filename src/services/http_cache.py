@@ -0,0 +1,222 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from services import metrics
+from services.http_client import get_client
+from services.loop_guard import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# ":memory:" mantém os validadores só durante o processo (usado nos benchmarks)
+HTTP_CACHE_PATH: str = os.getenv("HTTP_CACHE_PATH", "data/http_cache.db")
+
+HTTP_CACHE = metrics.counter(
+    "furia_http_cache_total",
+    "GETs condicionais por host e resultado (not_modified, modified, uncached)",
+    ["host", "result"]
+)
+HTTP_CACHE_BYTES = metrics.counter(
+    "furia_http_downloaded_bytes_total", "Bytes recebidos pela rede (ainda comprimidos) por host", ["host"]
+)
+
+
+class Validated(NamedTuple):
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes          # corpo comprimido (zlib)
+    parsed: Dict[str, Any]  # parser (com versão) -> resultado já parseado deste corpo
+
+
+class ValidatorCache:
+    """
+    Validadores HTTP (ETag / Last-Modified) por URL, guardados em disco
+    (SQLite) junto com o corpo comprimido e os resultados já parseados.
+
+    Sobrevive a restarts: o primeiro GET depois do boot já sai condicional.
+    Os resultados parseados ficam em JSON, sob uma chave que inclui a versão
+    do módulo do parser: depois de um deploy que muda o parser, o corpo
+    guardado é parseado de novo em vez de servir o resultado antigo.
+    Métodos síncronos: chame via `run_blocking` a partir do event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " url TEXT PRIMARY KEY,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " body BLOB NOT NULL,"
+                " parsed BLOB,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, url: str) -> Optional[Validated]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, parsed FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body, parsed = row
+        try:
+            parsed = json.loads(parsed) if parsed else {}
+        except (TypeError, ValueError):
+            # formato antigo (pickle) ou corrompido: parseia de novo
+            parsed = {}
+        return Validated(etag, last_modified, body, parsed)
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], text: str) -> None:
+        body = zlib.compress(text.encode("utf-8"), 6)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO responses (url, etag, last_modified, body, parsed, stored_at)"
+                " VALUES (?, ?, ?, ?, NULL, ?)"
+                " ON CONFLICT(url) DO UPDATE SET etag=excluded.etag,"
+                " last_modified=excluded.last_modified, body=excluded.body,"
+                " parsed=NULL, stored_at=excluded.stored_at",
+                (url, etag, last_modified, body, time.time())
+            )
+
+    def put_parsed(self, url: str, parsed: Dict[str, Any]) -> None:
+        try:
+            blob = json.dumps(parsed, ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.warning("Resultado não serializável para o cache HTTP: %s", url)
+            return
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET parsed = ? WHERE url = ?", (blob, url))
+
+    def delete(self, url: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+validators = ValidatorCache(HTTP_CACHE_PATH)
+
+
+def _decompress(body: bytes) -> str:
+    return zlib.decompress(body).decode("utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _module_version(module_name: str) -> str:
+    """Hash do código-fonte do módulo (muda a cada deploy que altera o parser)."""
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    try:
+        return hashlib.blake2b(Path(path).read_bytes(), digest_size=6).hexdigest()
+    except (OSError, TypeError):
+        return ""
+
+
+def _parser_key(parse: Callable[..., Any], args: tuple) -> str:
+    return f"{parse.__module__}.{parse.__qualname__}@{_module_version(parse.__module__)}{args!r}"
+
+
+async def conditional_get(
+    host: str,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    revalidate: bool = True,
+) -> Optional[str]:
+    """
+    GET condicional: devolve o corpo se mudou desde a última vez, ou None
+    se o servidor respondeu 304 (nada novo). Com `revalidate=False` o GET
+    sai sem validadores e o corpo sempre volta.
+    """
+    text, _ = await _fetch(host, url, headers, timeout, revalidate)
+    return text
+
+
+async def fetch_parsed(
+    host: str,
+    url: str,
+    parse: Callable[..., Any],
+    *args: Any,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Any:
+    """
+    Baixa `url` e devolve `parse(corpo, *args)` (executado via `run_blocking`).
+
+    Em 304 o resultado guardado para o mesmo parser (na mesma versão) e
+    argumentos é devolvido sem parse algum; se ainda não houver, o corpo
+    guardado é parseado uma vez. O resultado precisa ser serializável em JSON.
+    """
+    text, entry = await _fetch(host, url, headers, timeout, revalidate=True)
+    parser_key = _parser_key(parse, args)
+    if text is None:
+        parsed = entry.parsed
+        if parser_key in parsed:
+            return parsed[parser_key]
+        text = await run_blocking(_decompress, entry.body)
+    else:
+        # corpo novo: os resultados anteriores não valem mais
+        parsed = {}
+
+    result = await run_blocking(parse, text, *args)
+    # sem validadores a linha foi apagada em `_fetch` e o UPDATE não grava nada
+    await run_blocking(validators.put_parsed, url, {**parsed, parser_key: result})
+    return result
+
+
+async def _fetch(
+    host: str,
+    url: str,
+    headers: Optional[Dict[str, str]],
+    timeout: Optional[float],
+    revalidate: bool,
+) -> Tuple[Optional[str], Optional[Validated]]:
+    """(corpo ou None em 304, entrada guardada) de um GET condicional."""
+    entry = await run_blocking(validators.get, url) if revalidate else None
+    request_headers = dict(headers or {})
+    if entry is not None:
+        if entry.etag:
+            request_headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            request_headers["If-Modified-Since"] = entry.last_modified
+
+    kwargs = {"headers": request_headers}
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    resp = await get_client(host).get(url, **kwargs)
+    HTTP_CACHE_BYTES.inc(host, amount=resp.num_bytes_downloaded)
+
+    if resp.status_code == 304 and entry is not None:
+        HTTP_CACHE.inc(host, "not_modified")
+        return None, entry
+    resp.raise_for_status()
+    text = resp.text
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if etag or last_modified:
+        HTTP_CACHE.inc(host, "modified")
+        await run_blocking(validators.put, url, etag, last_modified, text)
+    else:
+        HTTP_CACHE.inc(host, "uncached")
+        # os validadores antigos não valem para este corpo
+        await run_blocking(validators.delete, url)
+    return text, None
@@ -0,0 +1,194 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from typing import Dict, NamedTuple
+
+import httpx
+
+from services import metrics
+from services.resilience import MAX_RETRIES, RETRIES, admit, guard, retry_delay
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 exige o pacote `h2` (instalado via `httpx[http2]`)
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+# Brotli exige o pacote `brotli` (instalado via `httpx[brotli]`); sem ele, só gzip
+BROTLI_AVAILABLE: bool = (
+    importlib.util.find_spec("brotli") is not None or importlib.util.find_spec("brotlicffi") is not None
+)
+ACCEPT_ENCODING: str = "br, gzip, deflate" if BROTLI_AVAILABLE else "gzip, deflate"
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0, pool=5.0)
+KEEPALIVE_EXPIRY: float = 60.0
+
+
+class HostConfig(NamedTuple):
+    max_connections: int
+    http2: bool
+
+
+# Limites por host: Liquipedia pede poucas conexões simultâneas por cliente
+HOSTS: Dict[str, HostConfig] = {
+    "liquipedia.net": HostConfig(max_connections=2, http2=True),
+    "bo3.gg": HostConfig(max_connections=8, http2=True),
+    "draft5.gg": HostConfig(max_connections=4, http2=True),
+    "api.pandascore.co": HostConfig(max_connections=8, http2=True),
+}
+DEFAULT_HOST_CONFIG = HostConfig(max_connections=4, http2=False)
+
+# Redireciona todos os upstreams para um servidor local (usado pelos benchmarks)
+UPSTREAM_BASE_URL: str = os.getenv("UPSTREAM_BASE_URL", "").rstrip("/")
+
+
+def base_url(host: str) -> str:
+    """URL base de `host`, respeitando `UPSTREAM_BASE_URL`."""
+    return UPSTREAM_BASE_URL or f"https://{host}"
+
+
+UPSTREAM_LATENCY = metrics.histogram(
+    "furia_upstream_request_seconds", "Duração das requisições por host upstream", ["host"]
+)
+UPSTREAM_REQUESTS = metrics.counter(
+    "furia_upstream_requests_total", "Requisições por host upstream e status", ["host", "status"]
+)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Mede duração e status (ou erro) de cada requisição feita a `host`."""
+
+    def __init__(self, host: str, inner: httpx.AsyncBaseTransport) -> None:
+        self._host = host
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self._inner.handle_async_request(request)
+        except Exception:
+            UPSTREAM_REQUESTS.inc(self._host, "error")
+            raise
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, self._host)
+        UPSTREAM_REQUESTS.inc(self._host, str(response.status_code))
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Passa cada requisição a `host` pelo rate limiter e pelo circuit breaker
+    compartilhados (`services.resilience`). Erros de rede e respostas 5xx
+    contam como falha e são repetidos com jitter (só métodos idempotentes).
+    429 é devolvido na hora: quem chamou decide como respeitar o Retry-After.
+    """
+
+    def __init__(self, host: str, inner: httpx.AsyncBaseTransport) -> None:
+        self._host = host
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _, breaker = guard(self._host)
+        retries = MAX_RETRIES if request.method in IDEMPOTENT_METHODS else 0
+        for attempt in range(retries + 1):
+            await admit(self._host)
+            try:
+                response = await self._inner.handle_async_request(request)
+            except httpx.TransportError:
+                breaker.record_failure()
+                if attempt == retries:
+                    raise
+            except Exception:
+                breaker.record_failure()
+                raise
+            else:
+                if response.status_code == 429 or response.status_code >= 500:
+                    breaker.record_failure()
+                    if response.status_code == 429 or attempt == retries:
+                        return response
+                    await response.aclose()
+                else:
+                    breaker.record_success()
+                    return response
+            finally:
+                # cancelada no meio da requisição de teste: não prende o circuito
+                breaker.end_probe()
+            RETRIES.inc(self._host)
+            await asyncio.sleep(retry_delay(attempt))
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+class ClientRegistry:
+    """
+    Um `httpx.AsyncClient` por host, com pool de conexões keep-alive.
+    Criado no startup do bot e fechado no shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _create(self, host: str) -> httpx.AsyncClient:
+        config = HOSTS.get(host, DEFAULT_HOST_CONFIG)
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        )
+        transport = httpx.AsyncHTTPTransport(
+            http2=config.http2 and HTTP2_AVAILABLE,
+            limits=limits,
+        )
+        return httpx.AsyncClient(
+            transport=ResilientTransport(host, InstrumentedTransport(host, transport)),
+            timeout=DEFAULT_TIMEOUT,
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            follow_redirects=True,
+        )
+
+    def get(self, host: str) -> httpx.AsyncClient:
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._clients[host] = self._create(host)
+        return client
+
+    def start(self) -> None:
+        """Abre os clientes dos hosts conhecidos de antemão."""
+        if not HTTP2_AVAILABLE:
+            logger.info("Pacote h2 ausente: usando HTTP/1.1 com keep-alive")
+        if not BROTLI_AVAILABLE:
+            logger.info("Pacote brotli ausente: pedindo só gzip/deflate")
+        for host in HOSTS:
+            self.get(host)
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            if not client.is_closed:
+                await client.aclose()
+        self._clients.clear()
+
+
+clients = ClientRegistry()
+
+
+def get_client(host: str) -> httpx.AsyncClient:
+    """Retorna o cliente compartilhado para `host`."""
+    return clients.get(host)
+
+
+def start_clients() -> None:
+    """Cria os clientes (chamado no startup do bot)."""
+    clients.start()
+
+
+async def close_clients() -> None:
+    """Fecha todos os clientes (chamado no shutdown do bot)."""
+    await clients.aclose()
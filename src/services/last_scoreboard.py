@@ -1,31 +1,34 @@
-import datetime
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict
+import asyncio
+import logging
+from bs4 import SoupStrainer
+from typing import Dict, List, Tuple
 from typing import Optional
-from services.result_matcher import get_latest_match_info
+from services.cache import cached
+from services.html_parser import has_class, make_soup
+from services.http_cache import fetch_parsed
+from services.http_client import base_url
+from services.match_history import match_date
 
-URL_TEMPLATE = 'https://bo3.gg/matches/{team_slug}-vs-{opponent_slug}-{date_slug}'
+logger = logging.getLogger(__name__)
+
+URL_TEMPLATE = base_url('bo3.gg') + '/matches/{team_slug}-vs-{opponent_slug}-{date_slug}'
+
+# URL do bo3.gg já resolvida por (time, adversário, data); as mais antigas saem
+_resolved_urls: Dict[Tuple[str, str, str], str] = {}
+RESOLVED_URLS_MAX: int = 256
 
-def build_bo3_url(team_slug: str, headers: dict) -> Optional[str]:
-    info = get_latest_match_info(team_slug, headers)
-    if not info:
-        print('❌ Não foi possível obter informações do jogo.')
-        return None
 
+def build_bo3_urls(team_slug: str, info: dict) -> List[str]:
+    """
+    Monta as URLs candidatas do bo3.gg para o jogo descrito em `info`
+    (saída de `get_latest_match_info`). Lista vazia se a data não for reconhecida.
+    """
     # converte data
-    raw_date = info['Date'].split(' -', 1)[0].strip()
-    dt = None
-    for fmt in ('%d %b %Y','%b %d, %Y','%Y-%m-%d'):
-        try:
-            dt = datetime.datetime.strptime(raw_date, fmt)
-            break
-        except ValueError:
-            continue
-    if not dt:
-        print('❌ Data em formato inesperado:', raw_date)
-        return None
-    date_slug = dt.strftime('%d-%m-%Y')
+    played_on = match_date(info['Date'])
+    if not played_on:
+        logger.warning('Data em formato inesperado: %s', info['Date'])
+        return []
+    date_slug = played_on.strftime('%d-%m-%Y')
 
     # formata o slug da equipe FURIA ou FURIA_Female
     if team_slug == 'FURIA':
@@ -42,74 +45,108 @@ def build_bo3_url(team_slug: str, headers: dict) -> Optional[str]:
     # troca espaços e underscores por hífen apenas na base
     base = base.replace(' ', '-').replace('_','-')
 
-    # se for line feminina, append "_fe", senão nada
+    # se for line feminina, o bo3.gg usa "_fe" ou "-fe" no adversário
     if team_slug == 'FURIA_Female':
-        opponent_slug = f"{base}_fe"
+        opponent_slugs = [f"{base}_fe", f"{base}-fe"]
     else:
-        opponent_slug = base
-
-    # monta as duas variantes só para debug (normal e fallback)
-    url = URL_TEMPLATE.format(
-        team_slug=team_slug_formatted,
-        opponent_slug=opponent_slug,
-        date_slug=date_slug
-    )
+        opponent_slugs = [base]
+
+    return [
+        URL_TEMPLATE.format(
+            team_slug=team_slug_formatted,
+            opponent_slug=opponent_slug,
+            date_slug=date_slug
+        )
+        for opponent_slug in opponent_slugs
+    ]
+
+
+async def get_latest_scoreboard(
+    team_slug: str,
+    info: dict,
+    urls: List[str],
+    refresh: bool = False
+) -> Dict[str, Dict[str, str]]:
+    """
+    Busca o scoreboard do último jogo. As URLs candidatas são baixadas em
+    paralelo e o primeiro GET que trouxer jogadores é usado (sem HEAD prévio).
+    A URL vencedora fica memorizada para os próximos cliques.
 
-    # checa se deu 404; se sim, tenta a variante com hífen antes do "_fe"
-    try:
-        r = requests.head(url, headers=headers, timeout=5)
-        if r.status_code == 404 and '_fe' in opponent_slug:
-            # tenta trocar "_fe" por "-fe"
-            alt_slug = opponent_slug.replace('_fe','-fe')
-            alt_url = URL_TEMPLATE.format(
-                team_slug=team_slug_formatted,
-                opponent_slug=alt_slug,
-                date_slug=date_slug
-            )
-            print(f"⚠️ 404 na URL “{url}”, tentando fallback “{alt_url}”")
-            r2 = requests.head(alt_url, headers=headers, timeout=5)
-            if r2.status_code == 200:
-                print(f"✅ Fallback válido: {alt_url}")
-                return alt_url
-    except Exception as e:
-        print("⚠️ Erro no head-check:", e)
+    `refresh=True` ignora o cache local (usado pelos aquecimentos pós-jogo,
+    quando o bo3.gg ainda pode estar preenchendo o scoreboard).
+    """
+    get_board = get_furia_scoreboard.refresh if refresh else get_furia_scoreboard
+    key = (team_slug, info['Opponent'], info['Date'])
+    resolved = _resolved_urls.get(key)
+    if resolved:
+        return await get_board(resolved) or {}
 
-    print(f'URL montada: {url}')
-    return url
+    async def fetch(url: str) -> Tuple[str, Optional[Dict[str, Dict[str, str]]]]:
+        return url, await get_board(url)
 
-def get_furia_score(url: str) -> Optional[str]:
+    tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                url, board = await next_done
+            except Exception:
+                continue
+            if board:
+                _resolved_urls[key] = url
+                if len(_resolved_urls) > RESOLVED_URLS_MAX:
+                    del _resolved_urls[next(iter(_resolved_urls))]
+                logger.info('URL do bo3.gg resolvida: %s', url)
+                return board
+        return {}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def get_furia_score(url: str) -> Optional[str]:
     """
     Busca o placar da FURIA na URL fornecida.
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Garantir que a requisição tenha sido bem-sucedida
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Encontrar a tabela onde o placar da FURIA está
-        players_table = soup.find_all('div', class_='table-row')
-        
-        for player_row in players_table:
-            # Verifique se o jogador é da FURIA
-            player_name = player_row.find('span', class_='nickname')
-            if player_name and 'FURIA' in player_name.text:  # Confirma se é um jogador da FURIA
-                score_cells = player_row.find_all('div', class_='table-cell')
-                if score_cells:
-                    # Extraímos os dados de "K", "D", "A" (Kills, Deaths, Assists)
-                    kills = score_cells[0].text.strip()
-                    deaths = score_cells[1].text.strip()
-                    assists = score_cells[2].text.strip()
-                    return f'Kills: {kills}, Deaths: {deaths}, Assists: {assists}'
-        return None
+        return await fetch_parsed("bo3.gg", url, parse_furia_score)
     except Exception as e:
-        print(f'Erro ao obter o placar: {e}')
+        logger.warning('Erro ao obter o placar: %r', e)
         return None
 
 
-def get_furia_scoreboard(url: str, max_players: int = 5) -> Dict[str, Dict[str, str]]:
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, 'html.parser')
+def parse_furia_score(html: str) -> Optional[str]:
+    soup = make_soup(html, SoupStrainer('div', class_=has_class('table-row')))
+
+    # Encontrar a tabela onde o placar da FURIA está
+    players_table = soup.find_all('div', class_='table-row')
+
+    for player_row in players_table:
+        # Verifique se o jogador é da FURIA
+        player_name = player_row.find('span', class_='nickname')
+        if player_name and 'FURIA' in player_name.text:  # Confirma se é um jogador da FURIA
+            score_cells = player_row.find_all('div', class_='table-cell')
+            if score_cells:
+                # Extraímos os dados de "K", "D", "A" (Kills, Deaths, Assists)
+                kills = score_cells[0].text.strip()
+                deaths = score_cells[1].text.strip()
+                assists = score_cells[2].text.strip()
+                return f'Kills: {kills}, Deaths: {deaths}, Assists: {assists}'
+    return None
+
+
+@cached("bo3_scoreboard")
+async def get_furia_scoreboard(url: str, max_players: int = 5) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Scoreboard da partida em `url`. None enquanto a página não tiver
+    jogadores (o bo3.gg preenche depois do jogo): o cache não guarda None,
+    então o próximo clique ou aquecimento busca de novo.
+    """
+    board = await fetch_parsed("bo3.gg", url, parse_furia_scoreboard, max_players, timeout=10)
+    return board or None
+
+
+def parse_furia_scoreboard(html: str, max_players: int = 5) -> Dict[str, Dict[str, str]]:
+    soup = make_soup(html, SoupStrainer('div', class_=has_class('table-row')))
 
     scoreboard: Dict[str, Dict[str, str]] = {}
     rows = soup.find_all('div', class_='table-row')
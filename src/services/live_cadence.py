@@ -0,0 +1,73 @@
+import datetime
+import os
+from typing import Dict, Optional
+
+# Cadência do poller do /live, em segundos
+LIVE_POLL_INTERVAL: float = float(os.getenv("LIVE_POLL_INTERVAL", "7.5"))
+IDLE_POLL_BASE: float = 45.0
+IDLE_POLL_MAX: float = float(os.getenv("LIVE_IDLE_POLL_MAX", "900"))
+# Volta ao ritmo rápido um pouco antes do horário marcado da partida
+WAKE_LEAD: float = 5 * 60
+# Cota da PandaScore: abaixo disso, espaça as chamadas pelo resto da janela
+RATE_LIMIT_WINDOW: float = 3600.0
+RATE_LIMIT_LOW: int = 50
+
+
+class LiveCadence:
+    """
+    Decide quando o poller do /live deve rodar de novo:
+
+    - alguma partida ao vivo (`live`, por line): `LIVE_POLL_INTERVAL`;
+    - nada ao vivo: backoff exponencial de `IDLE_POLL_BASE` até `IDLE_POLL_MAX`,
+      mas acordando perto do próximo início agendado (e seguindo no ritmo
+      rápido enquanto a partida não aparece, se começar atrasada);
+    - cota baixa ou 429: respeita `Retry-After` e espaça as chamadas.
+    """
+
+    def __init__(self) -> None:
+        self.idle_streak = 0
+        self.current: float = IDLE_POLL_BASE
+        # o último intervalo foi esticado por Retry-After ou cota baixa
+        self.throttled = False
+        # intervalo efetivo por partida (match_id) para as métricas
+        self.by_match: Dict[int, float] = {}
+
+    def next_delay(
+        self,
+        live: Dict[str, dict],
+        rate_limit_remaining: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        next_start: Optional[datetime.datetime] = None,
+        now: Optional[datetime.datetime] = None,
+    ) -> float:
+        if live:
+            self.idle_streak = 0
+            delay = LIVE_POLL_INTERVAL
+        else:
+            self.idle_streak += 1
+            delay = min(IDLE_POLL_BASE * 2 ** (self.idle_streak - 1), IDLE_POLL_MAX)
+            if next_start is not None:
+                now = now or datetime.datetime.now(next_start.tzinfo)
+                until_wake = (next_start - now).total_seconds() - WAKE_LEAD
+                if until_wake <= 0:
+                    # janela da partida (inclusive atrasada): ritmo rápido, e o
+                    # backoff recomeça da base quando a janela acabar
+                    self.idle_streak = 0
+                delay = min(delay, max(until_wake, LIVE_POLL_INTERVAL))
+
+        self.throttled = False
+        if rate_limit_remaining is not None and rate_limit_remaining < RATE_LIMIT_LOW:
+            delay = max(delay, RATE_LIMIT_WINDOW / max(rate_limit_remaining, 1))
+            self.throttled = True
+        if retry_after:
+            delay = max(delay, retry_after)
+            self.throttled = True
+
+        self.current = delay
+        self.by_match = {info["match_id"]: delay for info in live.values() if info.get("match_id")}
+        return delay
+
+    @property
+    def idle(self) -> bool:
+        """Em backoff ocioso (nenhuma partida ao vivo no último tick)?"""
+        return self.idle_streak > 0
@@ -1,37 +1,251 @@
-import httpx
+import logging
 import os
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from services.http_client import base_url, get_client
+from services.live_cadence import LIVE_POLL_INTERVAL
+from services.loop_guard import run_blocking
+from services.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
 
 PANDASCORE_TOKEN = os.getenv("PANDASCORE_TOKEN")
+# Lista ao vivo reaproveitada entre os workers do modo multi-processo
+LIVE_SHARED_KEY = ("pandascore_live",)
+LIVE_SHARED_TTL: float = LIVE_POLL_INTERVAL * 0.8
+# Rodadas guardadas por partida (MR12 com prorrogações cabe com folga)
+ROUND_HISTORY_SIZE: int = int(os.getenv("LIVE_ROUND_HISTORY", "64"))
+
+LINES = ("FURIA", "FURIA_Female")
+# Índice opponent_id -> line (slug do Liquipedia). IDs desconhecidos são
+# aprendidos pelo nome na primeira vez em que aparecem na lista ao vivo.
+LINE_BY_TEAM_ID: Dict[int, str] = {
+    int(team_id): line
+    for line, team_id in (
+        ("FURIA", os.getenv("PANDASCORE_FURIA_ID", "124530")),
+        ("FURIA_Female", os.getenv("PANDASCORE_FURIA_FEMALE_ID", "")),
+    )
+    if team_id.isdigit()
+}
+LINE_BY_NAME: Dict[str, str] = {
+    "furia": "FURIA",
+    "furia esports": "FURIA",
+    "furia fe": "FURIA_Female",
+    "furia female": "FURIA_Female",
+    "furia esports female": "FURIA_Female",
+}
+
+# Últimos headers de cota devolvidos pela PandaScore
+rate_limit: Dict[str, Optional[float]] = {"remaining": None, "retry_after": None}
+
+
+def _read_rate_limit(r: httpx.Response) -> None:
+    remaining = r.headers.get("X-Rate-Limit-Remaining")
+    retry_after = r.headers.get("Retry-After")
+    rate_limit["remaining"] = int(remaining) if remaining and remaining.isdigit() else None
+    try:
+        rate_limit["retry_after"] = float(retry_after) if retry_after else None
+    except ValueError:
+        rate_limit["retry_after"] = None
+
+
+def _line_of(opponent: Dict[str, Any]) -> Optional[str]:
+    line = LINE_BY_TEAM_ID.get(opponent.get("id"))
+    if line is None:
+        line = LINE_BY_NAME.get((opponent.get("name") or "").strip().lower())
+        if line is not None and opponent.get("id") is not None:
+            LINE_BY_TEAM_ID[opponent["id"]] = line
+    return line
+
 
-async def fetch_live_match():
+def _score(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _live_info(match: Dict[str, Any], line: str) -> Dict[str, Any]:
+    # aquecimento e intervalo entre mapas: placar, rodada e "live" podem vir nulos
+    t1 = match["opponents"][0]["opponent"]["name"]
+    t2 = match["opponents"][1]["opponent"]["name"]
+    scores = match.get("scores") or {}
+    score1, score2 = _score(scores.get("1")), _score(scores.get("2"))
+    return {
+        "line": line,
+        "round": (match.get("live") or {}).get("round"),
+        "score": f"{score1}x{score2}",
+        "score1": score1,
+        "score2": score2,
+        "team1": t1,
+        "team2": t2,
+        "match_id": match.get("id"),
+    }
+
+
+def filter_furia_matches(data: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
-    Consulta o endpoint de live score da Pandascore e devolve:
+    Partidas ao vivo das lines da FURIA, por line:
       {
-        "round": int,        # rodada atual
-        "score": "1x0",      # placar atual
-        "team1": "FURIA",
-        "team2": "MongolZ"
+        "FURIA": {
+          "line": "FURIA",
+          "round": int,        # rodada atual
+          "score": "1x0",      # placar atual
+          "team1": "FURIA",
+          "team2": "MongolZ",
+          "match_id": 123
+        },
+        ...
       }
-    ou None se não houver partida ao vivo.
+    Partidas sem nenhuma line da FURIA são ignoradas, assim como as que vêm
+    malformadas (sem os dois times): uma entrada ruim não derruba as outras.
     """
-    url = "https://api.pandascore.co/csgo/matches/live"
+    live: Dict[str, Dict[str, Any]] = {}
+    for match in data:
+        try:
+            for slot in match.get("opponents") or ():
+                line = _line_of(slot.get("opponent") or {})
+                if line is not None and line not in live:
+                    live[line] = _live_info(match, line)
+                    break
+        except (AttributeError, IndexError, KeyError, TypeError):
+            logger.warning("Partida ao vivo malformada ignorada: %r", match)
+    return live
+
+
+async def fetch_live_matches() -> Dict[str, Dict[str, Any]]:
+    """
+    Consulta o endpoint de live score da Pandascore uma vez e devolve as
+    partidas ao vivo de cada line da FURIA (ver `filter_furia_matches`).
+    No modo multi-processo, a lista buscada por um worker serve os demais.
+    """
+    if shared_cache is not None:
+        entry = await run_blocking(shared_cache.get, LIVE_SHARED_KEY)
+        if entry is not None and entry[1] > time.time():
+            return filter_furia_matches(entry[0])
+
+    url = f"{base_url('api.pandascore.co')}/csgo/matches/live"
     params = {"token": PANDASCORE_TOKEN}
-    async with httpx.AsyncClient() as client:
-        r = await client.get(url, params=params, timeout=10)
-        r.raise_for_status()
-        data = r.json()
-        if not data:
+    r = await get_client("api.pandascore.co").get(url, params=params, timeout=10)
+    _read_rate_limit(r)
+    r.raise_for_status()
+    data = r.json() or []
+    if shared_cache is not None:
+        await run_blocking(shared_cache.put, LIVE_SHARED_KEY, data, LIVE_SHARED_TTL)
+    return filter_furia_matches(data)
+
+
+class RoundHistory:
+    """
+    Ring buffer das rodadas observadas de uma partida: (rodada, placar1,
+    placar2) em um `array` de inteiros, 3 posições por rodada, com no
+    máximo `capacity` rodadas (as mais antigas são sobrescritas).
+    """
+
+    __slots__ = ("capacity", "_data", "_start", "_size")
+
+    def __init__(self, capacity: int = ROUND_HISTORY_SIZE) -> None:
+        self.capacity = capacity
+        self._data = array("h", bytes(2 * 3 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, index: int) -> int:
+        return (self._start + index) % self.capacity * 3
+
+    def _round_at(self, index: int) -> int:
+        return self._data[self._slot(index)]
+
+    def record(self, round_num: int, score1: int, score2: int) -> None:
+        """Grava o placar da rodada; a mesma rodada de novo só atualiza o placar."""
+        if self._size and self._round_at(self._size - 1) == round_num:
+            slot = self._slot(self._size - 1)
+        elif self._size < self.capacity:
+            slot = self._slot(self._size)
+            self._size += 1
+        else:
+            slot = self._slot(0)
+            self._start = (self._start + 1) % self.capacity
+        self._data[slot:slot + 3] = array("h", (round_num, score1, score2))
+
+    def get(self, round_num: int) -> Optional[Tuple[int, int, int]]:
+        """(rodada, placar1, placar2) de `round_num`, ou da última gravada antes dela."""
+        if not self._size:
             return None
-        match = data[0]
-        
-        # supondo que o JSON traga scores por rodada e infos necessárias:
-        round_num = match["live"]["round"]
-        t1 = match["opponents"][0]["opponent"]["name"]
-        t2 = match["opponents"][1]["opponent"]["name"]
-        score = f"{match['scores']['1']}x{match['scores']['2']}"
-        return {
-            "round": round_num,
-            "score": score,
-            "team1": t1,
-            "team2": t2
-        }
+        index = self._find(round_num)
+        slot = self._slot(index)
+        return tuple(self._data[slot:slot + 3])
+
+    def step(self, round_num: int, delta: int) -> Optional[int]:
+        """Rodada gravada antes (`delta` = -1) ou depois (+1) de `round_num`."""
+        if not self._size:
+            return None
+        index = self._find(round_num)
+        if delta < 0 and self._round_at(index) < round_num:
+            # round_num não foi gravada: a anterior é a encontrada
+            return self._round_at(index)
+        index = min(max(index + delta, 0), self._size - 1)
+        return self._round_at(index)
+
+    def latest(self) -> Optional[int]:
+        return self._round_at(self._size - 1) if self._size else None
+
+    def _find(self, round_num: int) -> int:
+        # busca binária: as rodadas chegam em ordem crescente
+        lo, hi = 0, self._size - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._round_at(mid) <= round_num:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+
+class LiveTracker:
+    """
+    Estado de cada partida ao vivo acompanhada, por match_id, incluindo o
+    histórico de rodadas (`RoundHistory`) compartilhado por todos os chats.
+
+    `update()` recebe o resultado de um tick, grava a rodada atual de cada
+    partida e devolve as que terminaram (sumiram da lista ao vivo); o
+    estado delas, histórico incluso, é descartado.
+    """
+
+    def __init__(self) -> None:
+        self.matches: Dict[int, Dict[str, Any]] = {}
+
+    def update(self, live: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        current = {info["match_id"]: info for info in live.values()}
+        ended = [state for match_id, state in self.matches.items() if match_id not in current]
+        for state in ended:
+            del self.matches[state["match_id"]]
+        for match_id, info in current.items():
+            state = self.matches.get(match_id)
+            if state is None:
+                state = self.matches[match_id] = {
+                    "match_id": match_id, "line": info["line"], "rounds": RoundHistory()
+                }
+            state["info"] = info
+            snapshot = (info.get("round"), info.get("score1"), info.get("score2"))
+            # payload incompleto (rodada ainda sem número, placar ausente): não grava
+            if all(isinstance(v, int) and not isinstance(v, bool) and -32768 <= v <= 32767 for v in snapshot):
+                state["rounds"].record(*snapshot)
+        return ended
+
+    def match_for_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """Estado da partida ao vivo da line (info + rodadas), se houver."""
+        for state in self.matches.values():
+            if state["line"] == line:
+                return state
+        return None
+
+
+live_tracker = LiveTracker()
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+# Orçamento máximo (em segundos) que o event loop pode ficar bloqueado
+LOOP_BLOCK_BUDGET: float = float(os.getenv("LOOP_BLOCK_BUDGET_MS", "100")) / 1000
+WATCHDOG_INTERVAL: float = 0.05
+
+# Pool de threads para o parsing síncrono (BeautifulSoup etc.)
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PARSER_WORKERS", "4")),
+    thread_name_prefix="furia-parse",
+)
+
+# Estatísticas do watchdog: último atraso, maior atraso e estouros de orçamento
+loop_stats: Dict[str, float] = {"last_lag": 0.0, "max_lag": 0.0, "violations": 0}
+
+LOOP_LAG = metrics.histogram(
+    "furia_event_loop_lag_seconds", "Atraso do event loop medido pelo watchdog",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+LOOP_VIOLATIONS = metrics.counter(
+    "furia_event_loop_budget_violations_total", "Vezes que o loop estourou LOOP_BLOCK_BUDGET_MS"
+)
+
+_watchdog_task: Optional[asyncio.Task] = None
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Executa `func` no pool de threads, sem bloquear o event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+async def _watch_event_loop() -> None:
+    """Mede o atraso do event loop a cada `WATCHDOG_INTERVAL` segundos."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(WATCHDOG_INTERVAL)
+        lag = max(0.0, time.perf_counter() - start - WATCHDOG_INTERVAL)
+        loop_stats["last_lag"] = lag
+        loop_stats["max_lag"] = max(loop_stats["max_lag"], lag)
+        LOOP_LAG.observe(lag)
+        if lag > LOOP_BLOCK_BUDGET:
+            loop_stats["violations"] += 1
+            LOOP_VIOLATIONS.inc()
+            logger.warning(
+                "Event loop bloqueado por %.0f ms (orçamento: %.0f ms)",
+                lag * 1000, LOOP_BLOCK_BUDGET * 1000
+            )
+
+
+def start_watchdog() -> None:
+    """Inicia o watchdog do event loop (chamado no startup do bot)."""
+    global _watchdog_task
+    loop = asyncio.get_running_loop()
+    # em modo debug (PYTHONASYNCIODEBUG=1) o asyncio também loga o callback culpado
+    loop.slow_callback_duration = LOOP_BLOCK_BUDGET
+    if _watchdog_task is None or _watchdog_task.done():
+        _watchdog_task = loop.create_task(_watch_event_loop())
+
+
+async def stop_watchdog() -> None:
+    """Para o watchdog e libera o pool de threads."""
+    global _watchdog_task
+    if _watchdog_task is not None:
+        _watchdog_task.cancel()
+        try:
+            await _watchdog_task
+        except asyncio.CancelledError:
+            pass
+        _watchdog_task = None
+    _executor.shutdown(wait=False)
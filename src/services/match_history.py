@@ -0,0 +1,159 @@
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ":memory:" mantém o índice só durante o processo (usado nos benchmarks)
+MATCH_HISTORY_PATH: str = os.getenv("MATCH_HISTORY_PATH", "data/match_history.db")
+# Partidas lidas na primeira sincronização de uma line (as seguintes só leem as novas)
+BACKFILL_LIMIT: int = int(os.getenv("MATCH_HISTORY_BACKFILL", "200"))
+# Partidas mais recentes relidas em toda sincronização: o Liquipedia costuma
+# publicar um placar parcial/provisório e corrigi-lo depois
+REVISIT_SIZE: int = int(os.getenv("MATCH_HISTORY_REVISIT", "10"))
+# Últimas partidas de cada line mantidas em memória
+RECENT_SIZE: int = 20
+
+COLUMNS = ("date", "event", "opponent", "score", "result")
+
+
+def match_date(date_text: str) -> Optional[datetime.date]:
+    """Data de uma partida do Liquipedia ("May 28, 2025 - 18:00 CEST", "28 May 2025"...)."""
+    raw_date = date_text.split(' -', 1)[0].strip()
+    for fmt in ('%d %b %Y', '%b %d, %Y', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(raw_date, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class MatchHistory:
+    """
+    Índice local do histórico de partidas por line (FURIA, FURIA_Female).
+
+    Chave: (line, data, adversário). As linhas chegam da página de Matches
+    do Liquipedia, da mais recente para a mais antiga; `add()` recebe as
+    partidas novas mais as `REVISIT_SIZE` mais recentes já conhecidas, e
+    as conhecidas têm evento/placar/resultado atualizados (upsert).
+
+    Métodos síncronos: chame via `run_blocking` a partir do event loop,
+    exceto `recent()`, servido da memória.
+    """
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._recent: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                " team TEXT NOT NULL,"
+                " date TEXT NOT NULL,"
+                " opponent TEXT NOT NULL,"
+                " event TEXT,"
+                " score TEXT,"
+                " result TEXT,"
+                " played_on TEXT,"
+                # ordem na página: menor = mais recente
+                " position INTEGER NOT NULL,"
+                " PRIMARY KEY (team, date, opponent))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS matches_recent ON matches (team, played_on DESC, position)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS matches_opponent ON matches (team, opponent COLLATE NOCASE)"
+            )
+            self._conn.commit()
+
+    def known_keys(self, team: str) -> Set[Tuple[str, str]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, opponent FROM matches WHERE team = ?", (team,)
+            ).fetchall()
+        return set(rows)
+
+    def add(self, team: str, matches: List[Dict[str, str]]) -> int:
+        """
+        Grava partidas (mais recente primeiro): as novas entram acima das já
+        conhecidas, as conhecidas têm evento/placar/resultado corrigidos.
+        Devolve quantas partidas entraram ou mudaram.
+        """
+        if not matches:
+            return 0
+        with self._lock, self._conn:
+            (top,) = self._conn.execute(
+                "SELECT COALESCE(MIN(position), 0) FROM matches WHERE team = ?", (team,)
+            ).fetchone()
+            known = set(self._conn.execute(
+                "SELECT date, opponent FROM matches WHERE team = ?", (team,)
+            ).fetchall())
+            position = top - sum((m["Date"], m["Opponent"]) not in known for m in matches)
+            rows = []
+            for m in matches:
+                played_on = match_date(m["Date"])
+                # a posição de uma partida já conhecida é mantida pelo upsert
+                rows.append((
+                    team, m["Date"], m["Opponent"], m["Event"], m["Score"], m["Result"],
+                    played_on.isoformat() if played_on else None, position,
+                ))
+                if (m["Date"], m["Opponent"]) not in known:
+                    position += 1
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT INTO matches"
+                " (team, date, opponent, event, score, result, played_on, position)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(team, date, opponent) DO UPDATE SET"
+                " event=excluded.event, score=excluded.score, result=excluded.result"
+                " WHERE event IS NOT excluded.event OR score IS NOT excluded.score"
+                " OR result IS NOT excluded.result",
+                rows
+            )
+            changed = self._conn.total_changes - before
+        if changed or team not in self._recent:
+            self._recent[team] = self.latest(team, RECENT_SIZE)
+        return changed
+
+    def _select(self, where: str, params: tuple, limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM matches WHERE {where}"
+                " ORDER BY played_on IS NULL, played_on DESC, position LIMIT ?",
+                params + (limit,)
+            ).fetchall()
+        return [
+            {"Date": d, "Event": e, "Opponent": o, "Score": s, "Result": r}
+            for d, e, o, s, r in rows
+        ]
+
+    def latest(self, team: str, limit: int = 1) -> List[Dict[str, Any]]:
+        """Últimas `limit` partidas da line, da mais recente para a mais antiga."""
+        return self._select("team = ?", (team,), limit)
+
+    def recent(self, team: str) -> List[Dict[str, Any]]:
+        """Últimas `RECENT_SIZE` partidas da line, da memória."""
+        cached = self._recent.get(team)
+        if cached is None:
+            cached = self._recent[team] = self.latest(team, RECENT_SIZE)
+        return cached
+
+    def head_to_head(self, team: str, opponent: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Últimos confrontos contra `opponent` (nome sem diferenciar maiúsculas)."""
+        return self._select("team = ? AND opponent = ? COLLATE NOCASE", (team, opponent), limit)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+history = MatchHistory(MATCH_HISTORY_PATH)
@@ -0,0 +1,41 @@
+import datetime
+from typing import Dict, List, Optional
+
+# Agenda das partidas, preenchida pelo prefetch.py. Módulo leve (sem
+# scrapers): o /live e a enquete de torcida o importam já no startup.
+
+# Horários do draft5.gg são de Brasília (sem horário de verão desde 2019)
+BRT = datetime.timezone(datetime.timedelta(hours=-3))
+
+# Janela em que cliques e votos contam para a partida agendada
+MATCH_WINDOW_BEFORE = datetime.timedelta(hours=12)
+MATCH_WINDOW_AFTER = datetime.timedelta(hours=6)
+
+# Partidas costumam começar atrasadas: um início agendado continua valendo
+# para a cadência do /live por este tempo depois do horário marcado
+START_GRACE = datetime.timedelta(minutes=30)
+
+# Próximos inícios conhecidos por line (usado pela cadência do /live)
+scheduled_starts: Dict[str, List[datetime.datetime]] = {}
+
+
+def next_scheduled_start() -> Optional[datetime.datetime]:
+    """
+    Próximo início agendado entre as duas lines (None se desconhecido),
+    incluindo os que passaram há menos de `START_GRACE`.
+    """
+    since = datetime.datetime.now(BRT) - START_GRACE
+    upcoming = [s for starts in scheduled_starts.values() for s in starts if s > since]
+    return min(upcoming, default=None)
+
+
+def match_key(team_slug: str, now: Optional[datetime.datetime] = None) -> str:
+    """
+    Identificador da partida "atual" da line para a enquete de torcida:
+    o início agendado mais próximo dentro da janela, ou o dia de hoje.
+    """
+    now = now or datetime.datetime.now(BRT)
+    for start in scheduled_starts.get(team_slug, []):
+        if start - MATCH_WINDOW_BEFORE <= now <= start + MATCH_WINDOW_AFTER:
+            return f"{team_slug}:{start.isoformat()}"
+    return f"{team_slug}:{now.date().isoformat()}"
@@ -1,24 +1,196 @@
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from typing import Any, Optional
 import asyncio
+import datetime
+import json
+import logging
+import os
+import time
 
+import httpx
+
+from services import metrics
+from services.browser_pool import browser_pool
+from services.cache import cached
+from services.html_parser import make_soup
+from services.http_client import UPSTREAM_LATENCY, UPSTREAM_REQUESTS, base_url, get_client
+from services.match_schedule import BRT
+from services.loop_guard import run_blocking
+from services.resilience import call_with_resilience
+
+logger = logging.getLogger(__name__)
+
+# Chromium só quando o HTML não traz a agenda (0 desliga o fallback)
+DRAFT5_BROWSER_FALLBACK: bool = os.getenv("DRAFT5_BROWSER_FALLBACK", "1") == "1"
+
+MATCH_DATE_CLASS = 'MatchList__MatchListDate-sc-1pio0qc-0'
+NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+
+# Payload do Next.js (o draft5 não documenta o formato): props.pageProps.matches,
+# cada partida com teamA/teamB {teamName}, matchDate (epoch), seriesScoreA/B,
+# bestOf e tournament {tournamentName}, como em fixtures.draft5_upcoming_raw.
+# Campos diferentes caem para o browser em vez de serem adivinhados.
+
+DRAFT5_SOURCE = metrics.counter(
+    "furia_draft5_source_total", "De onde veio a agenda do draft5.gg (http ou browser)", ["source"]
+)
+
+
+@cached("draft5_upcoming")
 async def fetch_upcoming_matches(team_slug: str = '330-FURIA') -> list[dict]:
-    url = f'https://draft5.gg/equipe/{team_slug}/proximas-partidas'
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        await page.goto(url)
-        # espera o container de partidas aparecer
-        await page.wait_for_selector('p.MatchList__MatchListDate-sc-1pio0qc-0', timeout=10000)
-        content = await page.content()
-        await browser.close()
-
-    soup = BeautifulSoup(content, 'html.parser')
+    """
+    Próximas partidas de `team_slug` no draft5.gg.
+
+    Caminho rápido: um GET simples e a agenda lida do HTML (markup do SSR
+    ou payload `__NEXT_DATA__`). O Chromium só entra se o HTML não trouxer
+    a agenda ou o GET falhar.
+    """
+    url = f'{base_url("draft5.gg")}/equipe/{team_slug}/proximas-partidas'
+
+    try:
+        resp = await get_client("draft5.gg").get(url)
+        resp.raise_for_status()
+        upcoming = await run_blocking(extract_upcoming, resp.text)
+    except httpx.HTTPError as e:
+        logger.warning("GET do draft5.gg falhou (%r)", e)
+        upcoming = None
+
+    if upcoming is not None:
+        DRAFT5_SOURCE.inc("http")
+        return upcoming
+    if not DRAFT5_BROWSER_FALLBACK:
+        raise LookupError(f"agenda não encontrada no HTML de {url}")
+    logger.info("Agenda do draft5.gg não veio no HTML, usando o browser")
+    DRAFT5_SOURCE.inc("browser")
+    return await fetch_upcoming_matches_browser(url)
+
+
+async def fetch_upcoming_matches_browser(url: str) -> list[dict]:
+    """
+    Renderiza a página no Chromium do pool. Timeouts e erros do navegador
+    são repetidos com jitter sob o circuit breaker do host. Uma página que
+    carregou mas não mostra nenhuma data é uma agenda vazia, não uma falha.
+    """
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+    async def load() -> str:
+        start = time.perf_counter()
+        try:
+            async with browser_pool.page() as page:
+                await page.goto(url)
+                # espera o container de partidas aparecer
+                try:
+                    await page.wait_for_selector(f'p.{MATCH_DATE_CLASS}', timeout=10000)
+                except PlaywrightTimeoutError:
+                    logger.info("Nenhuma data na agenda do draft5.gg: sem partidas marcadas")
+                content = await page.content()
+        except Exception:
+            UPSTREAM_REQUESTS.inc("draft5.gg", "error")
+            raise
+        finally:
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, "draft5.gg")
+        UPSTREAM_REQUESTS.inc("draft5.gg", "200")
+        return content
+
+    content = await call_with_resilience("draft5.gg", load, retry_on=(PlaywrightError,))
+    return await run_blocking(parse_upcoming_matches, content)
+
+
+def extract_upcoming(html: str) -> Optional[list[dict]]:
+    """
+    Lê a agenda direto do HTML servido, sem browser.
+    [] se a agenda veio e está vazia; None se o HTML não trouxer a agenda
+    (formato desconhecido).
+    """
+    if MATCH_DATE_CLASS in html:
+        return parse_upcoming_matches(html)
+
+    start = html.find(NEXT_DATA_MARKER)
+    if start == -1:
+        return None
+    start = html.find('>', start) + 1
+    end = html.find('</script>', start)
+    if start == 0 or end == -1:
+        return None
+    try:
+        data = json.loads(html[start:end])
+    except ValueError:
+        return None
+
+    page_props = data.get('props', {}).get('pageProps', {}) if isinstance(data, dict) else {}
+    raw = page_props.get('matches') if isinstance(page_props, dict) else None
+    if not isinstance(raw, list):
+        return None
+    matches = [_match_from_json(item) if isinstance(item, dict) else None for item in raw]
+    if None in matches:
+        # campos diferentes dos conhecidos: o browser lê a página renderizada
+        return None
+    matches.sort(key=lambda m: m.pop('_start'))
+    return matches
+
+
+def _parse_start(value: Any) -> Optional[datetime.datetime]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # timestamps em milissegundos também aparecem
+        seconds = value / 1000 if value > 1e12 else value
+        return datetime.datetime.fromtimestamp(seconds, BRT)
+    if isinstance(value, str):
+        try:
+            dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return dt.astimezone(BRT) if dt.tzinfo else dt.replace(tzinfo=BRT)
+    return None
+
+
+def _date_label(start: datetime.datetime, now: Optional[datetime.datetime] = None) -> str:
+    """Data no formato dos títulos da lista do draft5.gg ("Hoje", "Amanhã", "14/06/2025")."""
+    today = (now or datetime.datetime.now(BRT)).date()
+    day = start.date()
+    if day == today:
+        return 'Hoje'
+    if day == today + datetime.timedelta(days=1):
+        return 'Amanhã'
+    return day.strftime('%d/%m/%Y')
+
+
+def _match_from_json(item: dict) -> Optional[dict]:
+    """Converte uma partida do payload no mesmo dict do parse do HTML."""
+    team_a, team_b = item.get('teamA'), item.get('teamB')
+    if not (isinstance(team_a, dict) and isinstance(team_b, dict)):
+        return None
+    start = _parse_start(item.get('matchDate'))
+    name_a, name_b = team_a.get('teamName'), team_b.get('teamName')
+    if start is None or not name_a or not name_b:
+        return None
+
+    score_a, score_b = item.get('seriesScoreA'), item.get('seriesScoreB')
+    best_of = item.get('bestOf')
+    tournament = item.get('tournament')
+    if isinstance(tournament, dict):
+        tournament = tournament.get('tournamentName')
+
+    return {
+        'date': _date_label(start),
+        'time': start.strftime('%H:%M'),
+        'team1': str(name_a), 'score1': str(score_a if score_a is not None else 0),
+        'team2': str(name_b), 'score2': str(score_b if score_b is not None else 0),
+        'best_of': f'MD{best_of}' if isinstance(best_of, int) else str(best_of or ''),
+        'tournament': str(tournament or ''),
+        '_start': start,
+    }
+
+
+def parse_upcoming_matches(content: str) -> list[dict]:
+    # árvore inteira: os cards de cada data são os irmãos seguintes do <p>
+    # dentro da lista; um SoupStrainer achataria a página e grudaria na última
+    # data os cards de outras seções
+    soup = make_soup(content)
     results = []
-    for date_tag in soup.select('p.MatchList__MatchListDate-sc-1pio0qc-0'):
+    for date_tag in soup.select(f'p.{MATCH_DATE_CLASS}'):
         date_text = date_tag.get_text(strip=True).replace('📅 ', '')
         for card in date_tag.find_next_siblings():
-            if card.name == 'p' and 'MatchList__MatchListDate-sc-1pio0qc-0' in card.get('class', []):
+            if card.name == 'p' and MATCH_DATE_CLASS in card.get('class', []):
                 break
             if card.name == 'a' and 'MatchCardSimple__MatchContainer-sc-wcmxha-0' in card.get('class', []):
                 time_text = card.select_one('small.MatchCardSimple__MatchTime-sc-wcmxha-3').get_text(strip=True)
@@ -44,5 +216,10 @@ async def fetch_upcoming_matches(team_slug: str = '330-FURIA') -> list[dict]:
 
 # para testar
 if __name__ == '__main__':
-    data = asyncio.run(fetch_upcoming_matches())
-    print(data)
+    async def _main():
+        try:
+            print(await fetch_upcoming_matches())
+        finally:
+            await browser_pool.close()
+
+    asyncio.run(_main())
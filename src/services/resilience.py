@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Tuple, Type, TypeVar
+
+import httpx
+
+from services import metrics
+from services.sharding import SHARDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MAX_RETRIES: int = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+RETRY_BASE_DELAY: float = 0.3
+RETRY_MAX_DELAY: float = 3.0
+# Espera máxima por uma ficha do rate limiter antes de falhar rápido
+MAX_QUEUE_WAIT: float = float(os.getenv("UPSTREAM_MAX_QUEUE_WAIT", "5"))
+
+
+class HostPolicy(NamedTuple):
+    rate: float                # requisições por segundo
+    burst: int                 # tamanho do balde
+    failure_threshold: int     # falhas seguidas que abrem o circuito
+    reset_timeout: float       # segundos com o circuito aberto
+
+
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    # etiqueta do Liquipedia: ~1 requisição a cada 2 s
+    "liquipedia.net": HostPolicy(rate=0.5, burst=3, failure_threshold=3, reset_timeout=60),
+    "bo3.gg": HostPolicy(rate=5, burst=10, failure_threshold=5, reset_timeout=30),
+    "draft5.gg": HostPolicy(rate=2, burst=4, failure_threshold=3, reset_timeout=60),
+    "api.pandascore.co": HostPolicy(rate=1, burst=5, failure_threshold=5, reset_timeout=30),
+}
+DEFAULT_POLICY = HostPolicy(rate=5, burst=10, failure_threshold=5, reset_timeout=30)
+
+CIRCUIT_OPEN = metrics.gauge("furia_circuit_open", "1 se o circuito do host está aberto", ["host"])
+RETRIES = metrics.counter("furia_upstream_retries_total", "Novas tentativas por host", ["host"])
+FAST_FAILS = metrics.counter(
+    "furia_upstream_fast_fail_total", "Requisições recusadas sem ir ao upstream", ["host", "reason"]
+)
+
+
+class UpstreamUnavailable(httpx.TransportError):
+    """O host está com o circuito aberto ou sem fichas no rate limiter."""
+
+
+class TokenBucket:
+    """
+    Rate limiter de balde de fichas (assíncrono). Cada chamada reserva a
+    sua ficha na hora (o saldo pode ficar negativo: são as reservas na
+    fila) e só então dorme, fora de qualquer lock: a espera de quem está
+    na fila é conhecida antes de dormir e nunca passa de `max_wait`.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, max_wait: float = MAX_QUEUE_WAIT) -> bool:
+        """Reserva uma ficha; False (sem reservar) se a espera passaria de `max_wait`."""
+        self._refill()
+        wait = (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0
+        if wait > max_wait:
+            return False
+        self._tokens -= 1
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # desistiu na fila: devolve a reserva
+                self._tokens += 1
+                raise
+        return True
+
+
+class CircuitBreaker:
+    """
+    Fechado → aberto após `failure_threshold` falhas seguidas. Depois de
+    `reset_timeout`, deixa uma requisição de teste passar (meio-aberto).
+    """
+
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float = 0.0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.failures >= self.failure_threshold
+
+    def allow(self) -> bool:
+        if not self.is_open:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.is_open:
+            logger.info("Circuito de %s fechado", self.host)
+        self.failures = 0
+        self._probing = False
+        CIRCUIT_OPEN.set(0, self.host)
+
+    def end_probe(self) -> None:
+        """
+        Libera a vaga da requisição de teste. Chamado em `finally`: se ela
+        terminou sem sucesso nem falha registrados (ex.: cancelada), o
+        circuito volta a aceitar outro teste em vez de ficar preso.
+        """
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.is_open:
+            if self.failures == self.failure_threshold:
+                logger.warning("Circuito de %s aberto por %.0f s", self.host, self.reset_timeout)
+            self.opened_at = time.monotonic()
+            CIRCUIT_OPEN.set(1, self.host)
+
+
+_guards: Dict[str, Tuple[TokenBucket, CircuitBreaker]] = {}
+
+
+def guard(host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+    """
+    Rate limiter e circuit breaker compartilhados de `host`. No modo
+    multi-processo cada worker fica com 1/SHARDS da taxa e do balde.
+    """
+    pair = _guards.get(host)
+    if pair is None:
+        policy = HOST_POLICIES.get(host, DEFAULT_POLICY)
+        pair = _guards[host] = (
+            TokenBucket(policy.rate / SHARDS, max(1, policy.burst // SHARDS)),
+            CircuitBreaker(host, policy.failure_threshold, policy.reset_timeout),
+        )
+    return pair
+
+
+def retry_delay(attempt: int) -> float:
+    """Backoff exponencial com full jitter."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+
+async def admit(host: str) -> None:
+    """Aplica circuito e rate limit; levanta `UpstreamUnavailable` para falhar rápido."""
+    bucket, breaker = guard(host)
+    if not breaker.allow():
+        FAST_FAILS.inc(host, "circuit_open")
+        raise UpstreamUnavailable(f"circuito aberto para {host}")
+    if not await bucket.acquire():
+        # a requisição de teste (se era uma) nem chegou a sair
+        breaker.end_probe()
+        FAST_FAILS.inc(host, "rate_limited")
+        raise UpstreamUnavailable(f"rate limit local de {host} esgotado")
+
+
+async def call_with_resilience(
+    host: str,
+    func: Callable[[], Awaitable[T]],
+    retry_on: Tuple[Type[BaseException], ...],
+    retries: int = MAX_RETRIES,
+) -> T:
+    """
+    Executa `func` sob o rate limiter e o circuit breaker de `host`,
+    repetindo com jitter nas exceções de `retry_on`. Qualquer outra
+    exceção também conta como falha, mas sobe sem nova tentativa.
+    """
+    _, breaker = guard(host)
+    for attempt in range(retries + 1):
+        await admit(host)
+        try:
+            result = await func()
+        except retry_on:
+            breaker.record_failure()
+            if attempt == retries:
+                raise
+            RETRIES.inc(host)
+            await asyncio.sleep(retry_delay(attempt))
+            continue
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            breaker.end_probe()
+        breaker.record_success()
+        return result
+    raise AssertionError("unreachable")
@@ -1,11 +1,110 @@
 import re
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
+from typing import Container, List, Optional, Tuple
 
-def get_latest_match_info(team_slug: str, headers: dict) -> dict | None:
+from services.cache import cached
+from services.html_parser import iter_chunks, make_soup, slice_from
+from services.http_cache import conditional_get
+from services.http_client import base_url
+from services.loop_guard import run_blocking
+from services.match_history import BACKFILL_LIMIT, RECENT_SIZE, REVISIT_SIZE, history
+
+
+def parse_matches(
+    html: str,
+    known: Container[Tuple[str, str]] = (),
+    limit: Optional[int] = None,
+    revisit: int = 0
+) -> List[dict]:
+    """
+    Partidas da página de Matches, da mais recente para a mais antiga,
+    parando na primeira cuja chave (Date, Opponent) já está em `known`
+    (ou após `limit` partidas). As `revisit` primeiras linhas vêm sempre,
+    conhecidas ou não, para que correções de placar sejam relidas.
+    Função síncrona: deve rodar fora do event loop (via `run_blocking`).
+    """
+    table_html = slice_from(html, 'class="wikitable', 'table')
+    if table_html is None:
+        return []
+
+    end = table_html.find('</table>')
+    if end != -1:
+        table_html = table_html[:end]
+    matches = []
+    for chunk in iter_chunks(table_html, 'tr'):
+        cols = make_soup(chunk, SoupStrainer('td')).find_all('td')
+        if len(cols) < 9:
+            continue
+        match = _match_from_cols(cols)
+        if len(matches) >= revisit and (match["Date"], match["Opponent"]) in known:
+            break
+        matches.append(match)
+        if limit is not None and len(matches) >= limit:
+            break
+    return matches
+
+
+def _match_from_cols(cols: list) -> dict:
+    # 0 = data, 5 = evento, 7 = placar, 8 = adversário
+    date     = cols[0].text.strip()
+    event    = cols[5].text.strip()
+    score    = cols[7].text.strip()
+
+    # extrai adversário via <a title="…">
+    opp_a    = cols[8].find('a', title=True)
+    opponent = opp_a['title'].strip() if opp_a else cols[8].text.strip()
+
+    # determina vitória/derrota comparando números do placar
+    m = re.findall(r'\d+', score)
+    if len(m) >= 2:
+        left, right = map(int, m[:2])
+        result = "Vitória!🎉" if left > right else "Derrota...😿"
+    else:
+        result = "Vitória!🎉" if "win" in score.lower() else "Derrota...😿"
+
+    return {
+        "Date": date,
+        "Event": event,
+        "Opponent": opponent,
+        "Score": score,
+        "Result": result
+    }
+
+
+def _index_new_matches(team_slug: str, html: str) -> int:
+    """
+    Parseia as linhas novas e as `REVISIT_SIZE` mais recentes da página e
+    faz o upsert no índice local (placares corrigidos são atualizados).
+    """
+    known = history.known_keys(team_slug)
+    matches = parse_matches(html, known, limit=None if known else BACKFILL_LIMIT, revisit=REVISIT_SIZE)
+    return history.add(team_slug, matches)
+
+
+@cached("liquipedia_matches", ignore=("headers",), on_error=None)
+async def sync_match_history(team_slug: str, headers: dict) -> int:
+    """
+    Baixa a página de Matches do Liquipedia, acrescenta ao índice local as
+    partidas mais novas que a última conhecida e atualiza as mais recentes.
+    Devolve quantas entraram ou mudaram.
+
+    Passa pelo cache de "liquipedia_matches": dentro do TTL não há request,
+    e na janela stale a sincronização roda em background. O GET é
+    condicional: se a página não mudou (304), nada é parseado.
+    """
+    url = f'{base_url("liquipedia.net")}/counterstrike/{team_slug}/Matches?action=render'
+    # índice vazio (primeira carga ou banco apagado): baixa a página inteira
+    indexed = await run_blocking(history.recent, team_slug)
+    html = await conditional_get("liquipedia.net", url, headers, revalidate=bool(indexed))
+    if html is None:
+        return 0
+    return await run_blocking(_index_new_matches, team_slug, html)
+
+
+async def get_latest_match_info(team_slug: str, headers: dict) -> Optional[dict]:
     """
     Recupera os dados do último jogo para `team_slug` em Liquipedia,
-    lendo a página de Matches (não Results).
+    a partir do índice local (sincronizado com a página de Matches).
 
     Args:
         team_slug: 'FURIA' ou 'FURIA_Female'
@@ -15,48 +114,19 @@ def get_latest_match_info(team_slug: str, headers: dict) -> dict | None:
         Date, Event, Opponent, Score, Result
     ou None se não encontrar nada.
     """
+    results = await get_recent_results(team_slug, headers, limit=1)
+    return results[0] if results else None
+
+
+async def get_recent_results(team_slug: str, headers: dict, limit: int = 5) -> List[dict]:
+    """Últimos `limit` resultados de `team_slug`, do mais recente ao mais antigo."""
+    await sync_match_history(team_slug, headers)
+    if limit <= RECENT_SIZE:
+        return (await run_blocking(history.recent, team_slug))[:limit]
+    return await run_blocking(history.latest, team_slug, limit)
+
 
-    url = f'https://liquipedia.net/counterstrike/{team_slug}/Matches?action=render'
-    try:
-        res = requests.get(url, headers=headers)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, 'html.parser')
-
-        table = soup.find('table', class_='wikitable')
-        if not table:
-            return None
-
-        for row in table.find_all('tr')[1:]:
-            cols = row.find_all('td')
-            # neste layout há pelo menos 9 colunas.
-            if len(cols) >= 9:
-                # 0 = data, 5 = evento, 7 = placar, 8 = adversário
-                date     = cols[0].text.strip()
-                event    = cols[5].text.strip()
-                score    = cols[7].text.strip()
-
-                # extrai adversário via <a title="…">
-                opp_a    = cols[8].find('a', title=True)
-                opponent = opp_a['title'].strip() if opp_a else cols[8].text.strip()
-
-                # determina vitória/derrota comparando números do placar
-                m = re.findall(r'\d+', score)
-                if len(m) >= 2:
-                    left, right = map(int, m[:2])
-                    result = "Vitória!🎉" if left > right else "Derrota...😿"
-                else:
-                    result = "Vitória!🎉" if "win" in score.lower() else "Derrota...😿"
-
-                return {
-                    "Date": date,
-                    "Event": event,
-                    "Opponent": opponent,
-                    "Score": score,
-                    "Result": result
-                }
-
-        # se não achou nenhuma linha válida
-        return None
-
-    except requests.exceptions.RequestException:
-        return None
+async def get_head_to_head(team_slug: str, opponent: str, headers: dict, limit: int = 10) -> List[dict]:
+    """Últimos confrontos de `team_slug` contra `opponent`."""
+    await sync_match_history(team_slug, headers)
+    return await run_blocking(history.head_to_head, team_slug, opponent, limit)
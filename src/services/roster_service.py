@@ -1,19 +1,26 @@
-import httpx
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
+from services.cache import cached
+from services.html_parser import has_class, make_soup
+from services.http_cache import fetch_parsed
+from services.http_client import base_url
+
+@cached("liquipedia_roster")
 async def get_current_roster(team_slug: str) -> list[str]:
     """
     Retorna lista de nicknames do roster de `team_slug` em Liquipedia.
     """
-    url = f'https://liquipedia.net/counterstrike/{team_slug}?action=render'
+    url = f'{base_url("liquipedia.net")}/counterstrike/{team_slug}?action=render'
     headers = {
         'User-Agent': 'FuriaRosterBot/1.0',
         'Referer': f'https://liquipedia.net/counterstrike/{team_slug}'
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(url, headers=headers, timeout=10.0)
-        resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    # GET condicional: sem mudança (304), o roster já parseado é reaproveitado
+    return await fetch_parsed("liquipedia.net", url, parse_roster, headers=headers, timeout=10.0)
+
+
+def parse_roster(html: str) -> list[str]:
+    soup = make_soup(html, SoupStrainer('table', class_=has_class('roster-card')))
     table = soup.find('table', class_='wikitable wikitable-striped roster-card')
     if not table:
         return []
@@ -0,0 +1,45 @@
+import os
+from typing import Any, Dict, Optional
+
+# Modo multi-processo (ver router.py): SHARDS workers, cada um dono dos
+# chats com chat_id % SHARDS == SHARD_INDEX. Com SHARDS=1 tudo roda em um
+# único processo, como antes.
+SHARDS: int = max(1, int(os.getenv("SHARDS", "1")))
+SHARD_INDEX: int = int(os.getenv("SHARD_INDEX", "0"))
+
+# Chaves das updates que trazem o chat (ou o usuário, em chat privado)
+_CHAT_PATHS = (
+    ("message", "chat"),
+    ("edited_message", "chat"),
+    ("channel_post", "chat"),
+    ("edited_channel_post", "chat"),
+    ("callback_query", "message", "chat"),
+    ("my_chat_member", "chat"),
+    ("chat_member", "chat"),
+    ("chat_join_request", "chat"),
+    ("callback_query", "from"),
+    ("inline_query", "from"),
+)
+# poll_answer fica de fora de propósito: sem chat, vai para o shard 0, que
+# apura os votos de todas as enquetes de torcida (ver cheer_polls.py)
+
+
+def shard_of(chat_id: int, shards: int = SHARDS) -> int:
+    """Shard dono do chat (determinístico entre processos e restarts)."""
+    return chat_id % shards
+
+
+def owns(chat_id: int) -> bool:
+    """O processo atual é o dono do chat?"""
+    return SHARDS == 1 or shard_of(chat_id) == SHARD_INDEX
+
+
+def chat_id_of(update: Dict[str, Any]) -> Optional[int]:
+    """chat_id de uma update crua (JSON do Bot API), ou None se não houver."""
+    for path in _CHAT_PATHS:
+        node: Any = update
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+        if isinstance(node, dict) and isinstance(node.get("id"), int):
+            return node["id"]
+    return None
@@ -0,0 +1,85 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Hashable, Optional, Tuple
+
+from services.sharding import SHARDS
+
+logger = logging.getLogger(__name__)
+
+# Segundo nível do cache, compartilhado entre os workers do modo
+# multi-processo. Com um único processo fica desligado (SHARED_CACHE=0).
+SHARED_CACHE: bool = os.getenv("SHARED_CACHE", "1" if SHARDS > 1 else "0") == "1"
+SHARED_CACHE_PATH: str = os.getenv("SHARED_CACHE_PATH", "data/shared_cache.db")
+
+
+class SharedCache:
+    """
+    Cache em SQLite (WAL) visível a todos os processos da máquina.
+
+    Guarda o valor serializado com pickle e os prazos em relógio de parede
+    (`time.time()`), já que o `monotonic` de cada processo é diferente.
+    Métodos síncronos: chame via `run_blocking` a partir do event loop.
+    """
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " fresh_until REAL NOT NULL,"
+                " stale_until REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _key(key: Tuple[Hashable, ...]) -> str:
+        return repr(key)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Tuple[Any, float, float]]:
+        """(valor, fresh_until, stale_until) se a entrada ainda não venceu."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM cache WHERE key = ? AND stale_until > ?",
+                (self._key(key), time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return pickle.loads(row[0]), row[1], row[2]
+        except Exception:
+            logger.warning("Entrada ilegível no cache compartilhado: %r", key)
+            return None
+
+    def put(self, key: Tuple[Hashable, ...], value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        now = time.time()
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            logger.warning("Valor não serializável para o cache compartilhado: %r", key)
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO cache (key, value, fresh_until, stale_until) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value=excluded.value,"
+                " fresh_until=excluded.fresh_until, stale_until=excluded.stale_until",
+                (self._key(key), blob, now + ttl, now + ttl + stale_ttl)
+            )
+            self._conn.execute("DELETE FROM cache WHERE stale_until < ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+shared_cache: Optional[SharedCache] = SharedCache(SHARED_CACHE_PATH) if SHARED_CACHE else None
@@ -0,0 +1,165 @@
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from services.loop_guard import run_blocking
+from services.sharding import owns
+
+logger = logging.getLogger(__name__)
+
+# "sqlite" (padrão, sobrevive a restarts) ou "memory"
+LIVE_STORE: str = os.getenv("LIVE_STORE", "sqlite")
+LIVE_STORE_PATH: str = os.getenv("LIVE_STORE_PATH", "data/subscriptions.db")
+DEFAULT_LINE: str = "FURIA"
+
+
+class SubscriptionStore:
+    """
+    Estado das inscrições do /live por chat_id: line acompanhada (slug do
+    Liquipedia), message_id, hash do último texto renderizado e rodada
+    manual do `round_nav_handler`.
+
+    O estado vive num dict em memória (`states`); os backends persistentes
+    gravam em lote as entradas marcadas com `touch()` a cada `flush()`.
+    """
+
+    def __init__(self) -> None:
+        self.states: Dict[int, Dict[str, Any]] = {}
+        self._dirty: Set[int] = set()
+        self._removed: Set[int] = set()
+
+    def load(self) -> int:
+        """Recarrega as inscrições salvas; devolve quantas foram carregadas."""
+        return 0
+
+    def subscribe(self, chat_id: int, line: str = DEFAULT_LINE) -> Dict[str, Any]:
+        state = {"status": "active", "line": line, "message_id": None, "hash": None, "round": None}
+        self.states[chat_id] = state
+        self.touch(chat_id)
+        return state
+
+    def unsubscribe(self, chat_id: int) -> bool:
+        if self.states.pop(chat_id, None) is None:
+            return False
+        self._dirty.discard(chat_id)
+        self._removed.add(chat_id)
+        return True
+
+    def touch(self, chat_id: int) -> None:
+        """Marca a entrada como alterada para o próximo `flush()`."""
+        if chat_id in self.states:
+            self._dirty.add(chat_id)
+            self._removed.discard(chat_id)
+
+    def get(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        return self.states.get(chat_id)
+
+    def items(self) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        return iter(list(self.states.items()))
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def _take_changes(self) -> Tuple[list, list]:
+        rows = [
+            (
+                chat_id, state.get("line", DEFAULT_LINE), state.get("message_id"),
+                state.get("hash"), state.get("round")
+            )
+            for chat_id in self._dirty
+            if (state := self.states.get(chat_id)) is not None
+        ]
+        removed = [(chat_id,) for chat_id in self._removed]
+        self._dirty.clear()
+        self._removed.clear()
+        return rows, removed
+
+    async def flush(self) -> None:
+        self._dirty.clear()
+        self._removed.clear()
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStore(SubscriptionStore):
+    """Sem persistência: as inscrições somem no restart."""
+
+
+class SQLiteStore(SubscriptionStore):
+    """Persistência em SQLite (WAL), com escritas agrupadas por `flush()`."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS live_subscriptions ("
+                " chat_id INTEGER PRIMARY KEY,"
+                f" line TEXT NOT NULL DEFAULT '{DEFAULT_LINE}',"
+                " message_id INTEGER,"
+                " hash TEXT,"
+                " round INTEGER)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(live_subscriptions)")}
+            if "line" not in columns:
+                # bancos criados antes da escolha de line: todos seguiam a masculina
+                self._conn.execute(
+                    f"ALTER TABLE live_subscriptions ADD COLUMN line TEXT NOT NULL DEFAULT '{DEFAULT_LINE}'"
+                )
+            self._conn.commit()
+
+    def load(self) -> int:
+        # no modo multi-processo o banco é compartilhado: cada worker carrega só o seu shard
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, line, message_id, hash, round FROM live_subscriptions"
+            ).fetchall()
+        # atualiza no lugar: os handlers guardam referência ao dict
+        self.states.clear()
+        self.states.update(
+            (chat_id, {
+                "status": "active", "line": line, "message_id": message_id, "hash": hash_, "round": round_
+            })
+            for chat_id, line, message_id, hash_, round_ in rows
+            if owns(chat_id)
+        )
+        return len(self.states)
+
+    def _write(self, rows: list, removed: list) -> None:
+        with self._lock, self._conn:
+            if rows:
+                self._conn.executemany(
+                    "INSERT INTO live_subscriptions (chat_id, line, message_id, hash, round)"
+                    " VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(chat_id) DO UPDATE SET"
+                    " line=excluded.line, message_id=excluded.message_id,"
+                    " hash=excluded.hash, round=excluded.round",
+                    rows
+                )
+            if removed:
+                self._conn.executemany("DELETE FROM live_subscriptions WHERE chat_id = ?", removed)
+
+    async def flush(self) -> None:
+        rows, removed = self._take_changes()
+        if rows or removed:
+            await run_blocking(self._write, rows, removed)
+
+    def close(self) -> None:
+        rows, removed = self._take_changes()
+        self._write(rows, removed)
+        with self._lock:
+            self._conn.close()
+
+
+def create_store() -> SubscriptionStore:
+    if LIVE_STORE == "memory":
+        return MemoryStore()
+    return SQLiteStore(LIVE_STORE_PATH)
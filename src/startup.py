@@ -0,0 +1,66 @@
+"""
+Relatório de cold start: tempo de import por módulo e marcos do boot
+(bot pronto, polling iniciado, primeira resposta a um usuário).
+
+Importado antes de tudo em `bot.py`, então o relógio começa junto com o
+processo. Para o detalhe completo de imports: `python -X importtime bot.py`.
+"""
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator
+
+from services import metrics
+
+logger = logging.getLogger(__name__)
+
+BOOT_STARTED: float = time.perf_counter()
+
+# módulo -> segundos de import (inclusivo); marco -> segundos desde o boot
+import_times: Dict[str, float] = {}
+milestones: Dict[str, float] = {}
+
+STARTUP_SECONDS = metrics.gauge(
+    "furia_startup_seconds", "Segundos desde o início do processo até cada marco do boot", ["phase"]
+)
+IMPORT_SECONDS = metrics.gauge(
+    "furia_startup_import_seconds", "Tempo de import por módulo no boot", ["module"]
+)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Mede o bloco de import `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        import_times[name] = time.perf_counter() - start
+        IMPORT_SECONDS.set(import_times[name], name)
+
+
+def import_modules(names: Iterable[str]) -> None:
+    """Importa (e mede) módulos pesados; usado no warmup em background."""
+    for name in names:
+        with timed(name):
+            importlib.import_module(name)
+
+
+def mark(phase: str) -> None:
+    """Registra um marco do boot (só a primeira ocorrência conta)."""
+    if phase in milestones:
+        return
+    milestones[phase] = time.perf_counter() - BOOT_STARTED
+    STARTUP_SECONDS.set(milestones[phase], phase)
+    if phase == "first_reply":
+        logger.info("Primeira resposta %.0f ms após o início do processo", milestones[phase] * 1000)
+
+
+def report() -> None:
+    """Loga os imports mais lentos e os marcos registrados até agora."""
+    lines = [f"  {name:<28} {seconds * 1000:8.1f} ms"
+             for name, seconds in sorted(import_times.items(), key=lambda kv: -kv[1])]
+    lines += [f"  @{phase:<27} {seconds * 1000:8.1f} ms"
+              for phase, seconds in sorted(milestones.items(), key=lambda kv: kv[1])]
+    logger.info("Startup (imports e marcos):\n%s", "\n".join(lines))
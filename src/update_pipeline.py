@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, Optional
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from services import metrics
+
+# Latências (em segundos) das últimas updates, da entrada na fila à resposta
+LATENCY_WINDOW: int = 1000
+_latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+# Momento em que cada update entrou na fila, por id() do objeto
+_received_at: Dict[int, float] = {}
+
+UPDATE_LATENCY = metrics.histogram(
+    "furia_update_latency_seconds", "Tempo da entrada da update na fila até o fim do processamento"
+)
+
+
+class BoundedUpdateQueue(asyncio.Queue):
+    """
+    Fila de updates com backpressure.
+
+    O `Application` tira as updates da fila e cria uma task para cada uma,
+    então limitar só a fila não basta: aqui a vaga é liberada apenas no
+    `task_done()`, chamado quando a update termina de ser processada.
+    Com a fila cheia, o `put()` do webhook/polling espera.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        super().__init__()
+        self.capacity = capacity
+        self.in_flight = 0
+        self._room = asyncio.Event()
+        self._room.set()
+
+    async def put(self, item: Any) -> None:
+        while self.in_flight >= self.capacity:
+            self._room.clear()
+            await self._room.wait()
+        self.put_nowait(item)
+
+    def put_nowait(self, item: Any) -> None:
+        if self.in_flight >= self.capacity:
+            raise asyncio.QueueFull
+        self.in_flight += 1
+        # o sinal de parada (e outros objetos) nunca chega ao processor, que é quem limpa
+        if isinstance(item, Update):
+            _received_at[id(item)] = time.perf_counter()
+        super().put_nowait(item)
+
+    def task_done(self) -> None:
+        super().task_done()
+        self.in_flight -= 1
+        self._room.set()
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processa até `max_concurrent_updates` updates em paralelo, mas mantém a
+    ordem dentro de cada chat: updates do mesmo chat passam por um lock FIFO.
+
+    O lock do chat é tomado *antes* da vaga do semáforo: updates paradas na
+    fila de um chat não ocupam vagas, então um chat que dispara cliques não
+    trava os outros. Os locks são descartados assim que o chat fica ocioso.
+    """
+
+    def __init__(self, max_concurrent_updates: int) -> None:
+        super().__init__(max_concurrent_updates)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._waiters: Dict[int, int] = {}
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:  # type: ignore[misc]
+        # substitui o process_update da PTB, que pega o semáforo antes do lock
+        chat_id = _chat_id(update)
+        try:
+            if chat_id is None:
+                async with self._semaphore:
+                    await self.do_process_update(update, coroutine)
+                return
+
+            lock = self._locks.setdefault(chat_id, asyncio.Lock())
+            self._waiters[chat_id] = self._waiters.get(chat_id, 0) + 1
+            try:
+                async with lock, self._semaphore:
+                    await self.do_process_update(update, coroutine)
+            finally:
+                self._waiters[chat_id] -= 1
+                if not self._waiters[chat_id]:
+                    del self._waiters[chat_id]
+                    del self._locks[chat_id]
+        finally:
+            started = _received_at.pop(id(update), None)
+            if started is not None:
+                elapsed = time.perf_counter() - started
+                _latencies.append(elapsed)
+                UPDATE_LATENCY.observe(elapsed)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+def _chat_id(update: object) -> Optional[int]:
+    if isinstance(update, Update) and update.effective_chat:
+        return update.effective_chat.id
+    return None
+
+
+def latency_summary() -> Dict[str, float]:
+    """p50/p95/p99 (ms) da latência entrada-resposta nas últimas updates."""
+    samples = sorted(_latencies)
+    if not samples:
+        return {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+
+    def pct(p: float) -> float:
+        return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+    return {"count": len(samples), "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}